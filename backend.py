@@ -0,0 +1,72 @@
+import os
+
+import numpy as np
+
+BACKEND_ENV_VAR = "NEURALCLOUD_BACKEND"
+
+_NUMPY_NAMES = ("numpy", "cpu")
+_CUPY_NAMES = ("cupy", "gpu", "cuda")
+
+
+def get_array_module(backend=None):
+    """
+    배열 연산에 사용할 백엔드 모듈(numpy 또는 cupy)을 반환.
+    backend를 지정하지 않으면 NEURALCLOUD_BACKEND 환경 변수를 따르고, 기본값은 numpy.
+    CuPy는 실제로 요청될 때만 import 하므로 CPU 환경에서는 CUDA 초기화 비용이 없다.
+    """
+    if backend is not None and not isinstance(backend, str):
+        return backend  # 이미 모듈이 전달된 경우
+    name = (backend or os.environ.get(BACKEND_ENV_VAR) or "numpy").lower()
+    if name in _NUMPY_NAMES:
+        return np
+    if name in _CUPY_NAMES:
+        import cupy
+        return cupy
+    raise ValueError(f"Unknown array backend: {name!r} (expected 'numpy' or 'cupy').")
+
+
+def backend_name(xp):
+    """
+    백엔드 모듈의 이름을 반환.
+    """
+    return "numpy" if xp is np else "cupy"
+
+
+def asnumpy(array):
+    """
+    백엔드 배열을 호스트(numpy) 배열로 변환.
+    """
+    if isinstance(array, np.ndarray):
+        return array
+    if hasattr(array, "get"):
+        return array.get()
+    return np.asarray(array)
+
+
+def scatter_add(xp, array, indices, values):
+    """
+    array[indices] += values (중복 인덱스도 모두 누적).
+    """
+    if xp is np:
+        np.add.at(array, indices, values)
+    else:
+        import cupyx
+        cupyx.scatter_add(array, indices, values)
+
+
+def seeded_random(xp, seed, *key):
+    """
+    seed와 용도별 key에서 유도한 백엔드의 난수 생성기 (numpy/cupy 공통 RandomState API).
+    seed가 None이면 매번 다른 난수를 사용한다.
+    """
+    if seed is None:
+        return xp.random.RandomState()
+    return xp.random.RandomState(int(np.random.SeedSequence(seed, spawn_key=key).generate_state(1)[0]))
+
+
+def synchronize(xp):
+    """
+    장치에 대기 중인 커널이 모두 끝날 때까지 기다림 (numpy에서는 아무것도 하지 않음).
+    """
+    if xp is not np:
+        xp.cuda.Device().synchronize()
@@ -0,0 +1,214 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from backend import backend_name, synchronize
+from cochlea_processor import CochleaProcessor
+from memory import MemoryManager
+from neuron_model import NeuronNetwork
+from retina_processor import RetinaProcessor
+from text_processor import TextProcessor
+
+
+def measure(run, repeat, setup=None, items=1, warmup=1, xp=np):
+    """
+    run을 repeat번 실행하여 지연 시간 백분위수(ms), 초당 처리량, 최대 할당 메모리를 측정.
+    setup은 매 실행 전에 호출되며 시간에 포함되지 않는다. items는 실행 한 번이 처리하는 단위 수.
+    xp가 cupy이면 측정 구간 앞뒤에서 장치를 동기화하므로 커널 실행 시간까지 포함된다.
+    peak_host_alloc_bytes는 tracemalloc이 추적하는 호스트(Python/numpy) 할당만 포함하고,
+    cupy이면 측정 전에 비운 장치 메모리 풀이 측정 중 커진 최대 크기를 peak_device_pool_bytes로 함께 보고한다.
+    """
+    for _ in range(warmup):
+        if setup is not None:
+            setup()
+        run()
+    synchronize(xp)
+
+    device = backend_name(xp) == "cupy"
+    if device:
+        pool = xp.get_default_memory_pool()
+        pool.free_all_blocks()  # 풀은 해제된 블록을 보관하므로 비운 뒤의 크기 증가가 측정 중 최대 사용량
+        device_base = pool.total_bytes()
+    latencies = []
+    tracemalloc.start()
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        synchronize(xp)
+        start = time.perf_counter()
+        run()
+        synchronize(xp)
+        latencies.append(time.perf_counter() - start)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies = np.array(latencies) * 1000
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+    result = {
+        "repeat": repeat,
+        "latency_ms": {"mean": float(latencies.mean()), "p50": float(p50), "p90": float(p90),
+                       "p99": float(p99), "max": float(latencies.max())},
+        "throughput_per_s": float(items * repeat / (latencies.sum() / 1000)),
+        "peak_host_alloc_bytes": int(peak),
+    }
+    if device:
+        result["peak_device_pool_bytes"] = int(pool.total_bytes() - device_base)
+        result["device_pool_bytes"] = int(pool.total_bytes())
+    return result
+
+
+def random_patterns(rng, num_neurons, activity, count):
+    """
+    활성 비율이 activity인 정렬된 무작위 활성 뉴런 패턴 count개.
+    """
+    size = max(1, int(num_neurons * activity))
+    return [np.sort(rng.choice(num_neurons, size, replace=False)) for _ in range(count)]
+
+
+def bench_network(num_neurons, degree, repeat, seed, backend, activity, **dtypes):
+    """
+    NeuronNetwork의 뉴런 갱신, 가중치 학습, 가지치기/재연결 측정 (처리량 단위: 시냅스).
+    """
+    network = NeuronNetwork(num_neurons, degree, 4 * degree, backend=backend, seed=seed, **dtypes)
+    rng = np.random.default_rng(seed)
+    nnz = network.synapses.nnz
+    xp = network.xp
+    potential = xp.asarray(np.where(rng.random(num_neurons) < activity, 0.0, -100.0))
+
+    def reset_potential():
+        network.membrane_potential[:] = potential
+
+    cases = {
+        "update_neurons": measure(network.update_neurons, repeat, setup=reset_potential, items=nnz, xp=xp),
+        "update_weights": measure(network.update_weights, repeat, items=nnz, xp=xp),
+        "prune_and_rewire": measure(lambda: network.prune_and_rewire(force=True), repeat, items=nnz, xp=xp),
+    }
+    return [{"case": name, "num_neurons": num_neurons, "degree": degree, "synapses": nnz,
+             "synapse_bytes": network.synapses.memory_bytes(), **result}
+            for name, result in cases.items()]
+
+
+def bench_memory(num_neurons, degree, repeat, seed, backend, activity, memories, **dtypes):
+    """
+    MemoryManager의 기억 통합과 회상 측정 (저장된 기억 memories개).
+    """
+    network = NeuronNetwork(num_neurons, degree, 4 * degree, backend=backend, seed=seed, **dtypes)
+    memory_manager = MemoryManager(network)
+    rng = np.random.default_rng(seed)
+    for i, pattern in enumerate(random_patterns(rng, num_neurons, activity, memories)):
+        memory_manager.store_memory(f"memory {i}", pattern)
+    memory_manager.consolidate_memory()
+    new_patterns = iter(random_patterns(rng, num_neurons, activity, repeat + 1))
+    queries = random_patterns(rng, num_neurons, activity, 1)[0]
+
+    def store_new():
+        memory_manager.store_memory("new memory", next(new_patterns))
+
+    xp = network.xp
+    cases = {
+        "consolidate_memory": measure(memory_manager.consolidate_memory, repeat, setup=store_new, xp=xp),
+        "recall_memory": measure(lambda: memory_manager.recall_memory(queries), repeat, xp=xp),
+    }
+    memory_manager.long_term_memory.close()
+    return [{"case": name, "num_neurons": num_neurons, "degree": degree, "memories": memories, **result}
+            for name, result in cases.items()]
+
+
+def bench_encoders(num_neurons, repeat, seed):
+    """
+    세 감각 부호화기를 합성 입력으로 측정 (처리량 단위: 바이트, 샘플, 픽셀).
+    """
+
+    class Target:
+        pass
+
+    target = Target()
+    target.num_neurons = num_neurons
+    rng = np.random.default_rng(seed)
+    results = []
+
+    text = "".join(rng.choice(list("abcdefghijklmnopqrstuvwxyz 가나다라마"), 4096))
+    for encoding in ("byte", "codepoint", "ngram"):
+        text_processor = TextProcessor(target, encoding=encoding, cache_size=0)
+        result = measure(lambda: text_processor.process_text(text), repeat, items=len(text.encode("utf-8")))
+        results.append({"case": f"text_{encoding}", "num_neurons": num_neurons, **result})
+
+    audio = rng.standard_normal(44100).astype(np.float32)
+    cochlea_processor = CochleaProcessor(target)
+    result = measure(lambda: cochlea_processor.process_audio(audio, 44100), repeat, items=len(audio))
+    results.append({"case": "cochlea", "num_neurons": num_neurons, **result})
+
+    frame = rng.integers(0, 256, (720, 1280, 3), dtype=np.uint8)
+    retina_processor = RetinaProcessor(target)
+    try:
+        result = measure(lambda: retina_processor.process_image(frame), repeat, items=frame.shape[0] * frame.shape[1])
+    except ImportError as error:  # OpenCV가 없으면 건너뜀 (RetinaProcessor는 처리할 때 cv2를 import)
+        results.append({"case": "retina", "num_neurons": num_neurons, "skipped": str(error)})
+    else:
+        results.append({"case": "retina", "num_neurons": num_neurons, **result})
+    return results
+
+
+def parse_sizes(value):
+    return [int(float(size)) for size in value.split(",")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark NeuronNetwork and MemoryManager hot paths.")
+    parser.add_argument("--neurons", type=parse_sizes, default=[10000, 100000],
+                        help="comma-separated neuron counts (default: 10000,100000)")
+    parser.add_argument("--degrees", type=parse_sizes, default=[10, 100],
+                        help="comma-separated connections per neuron (default: 10,100)")
+    parser.add_argument("--repeat", type=int, default=10, help="timed runs per case (default: 10)")
+    parser.add_argument("--activity", type=float, default=0.01, help="fraction of active neurons (default: 0.01)")
+    parser.add_argument("--memories", type=int, default=1000, help="stored memories for recall (default: 1000)")
+    parser.add_argument("--backend", default="numpy", help="array backend (default: numpy)")
+    parser.add_argument("--index-dtype", default="int64", help="synapse target dtype (int64, int32, uint32)")
+    parser.add_argument("--weight-dtype", default="float64",
+                        help="synapse weight dtype (float64, float32, float16, uint8 = quantized)")
+    parser.add_argument("--state-dtype", default="float64", help="threshold/membrane potential dtype")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", choices=("network", "memory", "encoders"), action="append",
+                        help="run only the given group (repeatable)")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+    groups = args.only or ["network", "memory", "encoders"]
+    dtypes = {"index_dtype": args.index_dtype, "weight_dtype": args.weight_dtype, "state_dtype": args.state_dtype}
+
+    results = []
+    for num_neurons in args.neurons:
+        for degree in args.degrees:
+            if "network" in groups:
+                results += bench_network(num_neurons, degree, args.repeat, args.seed, args.backend, args.activity,
+                                         **dtypes)
+            if "memory" in groups:
+                results += bench_memory(num_neurons, degree, args.repeat, args.seed, args.backend, args.activity,
+                                        args.memories, **dtypes)
+            print(f"benchmarked {num_neurons} neurons x {degree} connections", file=sys.stderr)
+        if "encoders" in groups:
+            results += bench_encoders(num_neurons, args.repeat, args.seed)
+
+    report = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "backend": args.backend,
+        **dtypes,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
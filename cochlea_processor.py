@@ -1,25 +1,187 @@
+import queue
+import time
+import wave
+
 import numpy as np
-import sounddevice as sd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from stimulus import Stimulus, region_stimulus, sensory_region
+
+SAMPLE_RATE = 44100
+
+
+def mel_filterbank(sample_rate, frame_size, num_bands, fmin=20.0, fmax=None):
+    """
+    rfft 주파수 빈을 mel 척도의 삼각 필터 num_bands개로 묶는 (빈 수, 대역 수) 행렬.
+    """
+    if fmax is None:
+        fmax = sample_rate / 2
+
+    def to_mel(freq):
+        return 2595.0 * np.log10(1.0 + freq / 700.0)
+
+    def from_mel(mel):
+        return 700.0 * (10.0 ** (mel / 2595.0) - 1.0)
+
+    points = from_mel(np.linspace(to_mel(fmin), to_mel(fmax), num_bands + 2))
+    freqs = np.fft.rfftfreq(frame_size, 1.0 / sample_rate)
+    lower, center, upper = points[:-2, None], points[1:-1, None], points[2:, None]
+    rising = (freqs - lower) / (center - lower)
+    falling = (upper - freqs) / (upper - center)
+    return np.maximum(0.0, np.minimum(rising, falling)).T.astype(np.float32)
+
+
+def read_wav(path, chunk_size=65536):
+    """
+    WAV 파일을 float32 모노 조각으로 나누어 읽는 제너레이터. 첫 값으로 샘플레이트를 반환.
+    """
+    with wave.open(path, "rb") as f:
+        channels, width = f.getnchannels(), f.getsampwidth()
+        yield f.getframerate()
+        while True:
+            data = f.readframes(chunk_size)
+            if not data:
+                return
+            if width == 1:
+                samples = (np.frombuffer(data, dtype=np.uint8).astype(np.float32) - 128) / 128
+            elif width == 3:
+                raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+                samples = ((raw[:, 0] | raw[:, 1] << 8 | raw[:, 2] << 16) << 8 >> 8) / np.float32(2 ** 23)
+            else:
+                dtype = {2: np.int16, 4: np.int32}[width]
+                samples = np.frombuffer(data, dtype=dtype) / np.float32(2 ** (8 * width - 1))
+            yield samples.reshape(-1, channels).mean(axis=1, dtype=np.float32)
 
 
 class CochleaProcessor:
-    def __init__(self, neuron_network):
+    """
+    음성을 주파수 대역 자극으로 변환하는 클래스 (달팽이관 모방).
+    Hann 창을 씌운 프레임(frame_size)을 hop_size 간격으로 겹쳐 STFT를 구하고,
+    미리 계산한 mel 필터뱅크를 블록당 행렬 곱 한 번으로 적용해 num_bands개 대역의 로그 에너지를 얻는다.
+    """
+
+    def __init__(self, neuron_network, region_start=None, region_size=None, frame_size=2048, hop_size=512,
+                 num_bands=64):
         self.network = neuron_network
+        # 청각 신호를 받을 뉴런 영역 (기본값은 sensory_region의 청각 영역)
+        self.region_start, self.region_size = sensory_region(
+            "audio", neuron_network.num_neurons, region_start, region_size
+        )
+        self.frame_size = frame_size
+        self.hop_size = hop_size
+        self.num_bands = num_bands
+        self.window = np.hanning(frame_size).astype(np.float32)
+        self._filterbanks = {}  # 샘플레이트 -> 필터뱅크
+
+    def _filterbank(self, sample_rate):
+        filterbank = self._filterbanks.get(sample_rate)
+        if filterbank is None:
+            filterbank = mel_filterbank(sample_rate, self.frame_size, self.num_bands)
+            self._filterbanks[sample_rate] = filterbank
+        return filterbank
+
+    def _frame_bands(self, frames, filterbank):
+        """
+        (프레임 수, frame_size) 블록의 대역별 로그 에너지 (프레임 수, num_bands).
+        """
+        spectra = np.abs(np.fft.rfft(frames * self.window, axis=1)).astype(np.float32) ** 2
+        return np.log1p(spectra @ filterbank)
+
+    def _to_stimulus(self, bands):
+        """
+        대역 에너지를 [0, 1]로 정규화하여 자극으로 변환 (무음이면 빈 자극).
+        """
+        peak = bands.max()
+        if peak <= 0:
+            return Stimulus(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32))
+        return region_stimulus(bands / peak, self.network.num_neurons, self.region_start, self.region_size)
+
+    def _stream_bands(self, chunks, sample_rate):
+        """
+        오디오 조각을 이어 붙이며 완성된 프레임들의 대역 에너지 블록을 차례로 반환.
+        다음 조각과 겹치는 나머지 샘플은 버퍼에 남긴다.
+        """
+        filterbank = self._filterbank(sample_rate)
+        buffer = np.zeros(0, dtype=np.float32)
+        for chunk in chunks:
+            chunk = np.asarray(chunk, dtype=np.float32)
+            if chunk.ndim > 1:
+                chunk = chunk.mean(axis=1)
+            buffer = np.concatenate([buffer, chunk])
+            count = (len(buffer) - self.frame_size) // self.hop_size + 1
+            if count <= 0:
+                continue
+            frames = sliding_window_view(buffer, self.frame_size)[::self.hop_size][:count]
+            yield self._frame_bands(frames, filterbank)
+            buffer = buffer[count * self.hop_size:]
+
+    def stream(self, chunks, sample_rate=SAMPLE_RATE):
+        """
+        오디오 조각(콜백, 파일 등)의 이터러블을 받아 프레임마다 자극을 내보내는 제너레이터.
+        """
+        for bands in self._stream_bands(chunks, sample_rate):
+            for frame in bands:
+                yield self._to_stimulus(frame)
+
+    def stream_wav(self, path):
+        """
+        WAV 파일을 프레임별 자극 스트림으로 변환 (사운드 장치 없이 녹음 파일 일괄 처리).
+        """
+        chunks = read_wav(path)
+        sample_rate = next(chunks)
+        return self.stream(chunks, sample_rate)
 
     def process_audio(self, audio_data, sample_rate):
         """
-        음성을 주파수 신호로 변환 (달팽이관 모방).
+        음성 전체를 주파수 신호(희소 자극)로 변환 (모든 프레임의 대역 에너지 평균).
+        """
+        audio_data = np.asarray(audio_data, dtype=np.float32).reshape(-1)
+        if len(audio_data) < self.frame_size:
+            audio_data = np.pad(audio_data, (0, self.frame_size - len(audio_data)))
+        blocks = list(self._stream_bands([audio_data], sample_rate))
+        return self._to_stimulus(np.concatenate(blocks).mean(axis=0))
+
+    def process_wav(self, path):
+        """
+        WAV 파일 전체를 하나의 자극으로 변환.
+        """
+        chunks = read_wav(path)
+        sample_rate = next(chunks)
+        total, frames = np.zeros(self.num_bands, dtype=np.float32), 0
+        for bands in self._stream_bands(chunks, sample_rate):
+            total += bands.sum(axis=0)
+            frames += len(bands)
+        return self._to_stimulus(total / max(frames, 1))
+
+    def microphone_chunks(self, duration=None, sample_rate=SAMPLE_RATE):
+        """
+        마이크 입력 조각을 콜백에서 받아 차례로 반환하는 제너레이터 (duration이 None이면 계속).
+        """
+        import sounddevice as sd
+
+        chunks = queue.Queue()
+        deadline = None if duration is None else time.monotonic() + duration
+        with sd.InputStream(samplerate=sample_rate, channels=1, dtype='float32', blocksize=self.hop_size,
+                            callback=lambda indata, frames, time_info, status: chunks.put(indata[:, 0].copy())):
+            while deadline is None or time.monotonic() < deadline:
+                try:
+                    yield chunks.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+
+    def stream_microphone(self, duration=None, sample_rate=SAMPLE_RATE):
+        """
+        마이크 입력을 프레임별 자극 스트림으로 변환 (낮은 지연의 연속 입력).
         """
-        num_freq_bins = 128
-        fft_result = np.abs(np.fft.rfft(audio_data))[:num_freq_bins]
-        normalized = fft_result / np.max(fft_result)  # [0, 1]로 정규화
-        signals = np.pad(normalized, (0, self.network.num_neurons - len(normalized)), 'constant')
-        return signals
+        return self.stream(self.microphone_chunks(duration, sample_rate), sample_rate)
 
     def capture_microphone(self, duration=3):
         """
         마이크에서 음성을 캡처하고 달팽이관 처리.
+        녹음이 끝날 때까지 기다리지 않고 들어오는 조각마다 대역 에너지를 누적한다.
         """
-        audio_data = sd.rec(int(duration * 44100), samplerate=44100, channels=1, dtype='float32')
-        sd.wait()
-        return self.process_audio(audio_data.flatten(), 44100)
+        total, frames = np.zeros(self.num_bands, dtype=np.float32), 0
+        for bands in self._stream_bands(self.microphone_chunks(duration), SAMPLE_RATE):
+            total += bands.sum(axis=0)
+            frames += len(bands)
+        return self._to_stimulus(total / max(frames, 1))
@@ -1,61 +1,316 @@
+import argparse
+import json
+import os
+import queue
+import sys
+import time
+
+from ingestion import SensoryIngestion, on_request
 from neuron_model import NeuronNetwork
 from memory import MemoryManager
+from metrics import NULL_METRICS, Metrics, RecordSink, metrics_from_spec
 from retina_processor import RetinaProcessor
 from cochlea_processor import CochleaProcessor
+from replay import replay_entries, replay_stimuli
 from text_processor import TextProcessor
-import cupy as cp
-
+from sizing import format_plan, plan_network
+from snapshot import MANIFEST_NAME, load_memory, load_network, save_snapshot
 
-def main():
-    num_neurons = 1000000
-    min_connections = 1000
-    max_connections = 100000
 
-    # 뉴런 네트워크 및 처리기 초기화
-    network = NeuronNetwork(num_neurons, min_connections, max_connections)
-    memory_manager = MemoryManager(network)
-    retina_processor = RetinaProcessor(network)
-    cochlea_processor = CochleaProcessor(network)
-    text_processor = TextProcessor(network)
+def print_progress(done, total):
+    """
+    네트워크 초기화 진행 상황 출력.
+    """
+    print(f"\rInitializing network: {done / total:6.1%}", end="\n" if done == total else "",
+          file=sys.stderr, flush=True)
 
-    print("Neuron-based AI with dynamic synapses and memory is ready. Type 'exit' to quit.")
-    print("Commands: 'image', 'audio', 'text'")
 
+def console_commands(text_processor, requests, metrics=NULL_METRICS):
+    """
+    콘솔 명령을 읽는 제너레이터. 텍스트는 바로 자극으로 내보내고,
+    'image'/'audio'는 해당 감각의 요청 큐에 넣어 캡처가 입력 대기와 겹쳐 진행되게 한다.
+    'exit'을 받으면 다른 감각 소스도 끝낸다.
+    """
     while True:
-        user_input = input("Command: ")
-        if user_input.lower() == "exit":
+        user_input = input("Command: ").lower()
+        if user_input == "exit":
             break
-
-        if user_input.lower() == "image":
-            input_signals = retina_processor.capture_webcam()
-        elif user_input.lower() == "audio":
-            input_signals = cochlea_processor.capture_microphone()
-        elif user_input.lower() == "text":
+        if user_input in requests:
+            requests[user_input].put(())
+        elif user_input == "text":
             text = input("Enter text: ")
-            input_signals = text_processor.process_text(text)
+            with metrics.span("encode_text"):
+                stimulus = text_processor.process_text(text)
+            yield stimulus
         else:
             print("Invalid command.")
-            continue
+    for pending in requests.values():
+        pending.put(None)
+
+
+def process_tick(network, memory_manager, labels, input_signals, metrics=NULL_METRICS, learn=True, prune=True,
+                 consolidate=True, top_k=1, sprout=0):
+    """
+    한 틱의 파이프라인 (대화형 루프와 재생 모드가 공유).
+    자극 전달과 뉴런 갱신 뒤 learn이면 가중치 학습, prune이면 가지치기/재연결(활성 뉴런마다 sprout개의 새 연결)을 하고,
+    활성 패턴으로 기억을 회상한 다음 labels마다 기억으로 저장하고 consolidate이면 통합한다.
+    (활성 뉴런, 회상한 (입력, 유사도) 최대 top_k개) 를 반환.
+    """
+    # 뉴런 네트워크에 신호 전달 및 학습 (백그라운드 통합과 겹치지 않도록 잠금)
+    with memory_manager.lock:
+        with metrics.span("stimulate"):
+            network.stimulate_neurons(input_signals)
+        with metrics.span("update_neurons"):
+            network.update_neurons()
+        if learn:
+            with metrics.span("update_weights"):
+                network.update_weights()
+        if prune:
+            with metrics.span("prune_and_rewire"):
+                network.prune_and_rewire(sprout=sprout)
 
-        # 뉴런 네트워크에 신호 전달 및 학습
-        network.stimulate_neurons(cp.asarray(input_signals))
-        network.update_neurons()
-        network.update_weights()
-        network.prune_and_rewire()
+    # 활성화된 뉴런 가져오기
+    active_neurons = network.get_active_neurons()
 
-        # 활성화된 뉴런 가져오기
-        active_neurons = network.get_active_neurons()
+    # 기억 검색
+    with metrics.span("recall"):
+        recalled = memory_manager.recall_memories(active_neurons, top_k=top_k)
 
-        # 기억 검색 및 출력
-        recalled_memory = memory_manager.recall_memory(active_neurons)
-        if recalled_memory:
-            print(f"AI: I remember you said: {recalled_memory}")
+    # 기억 저장 및 통합
+    with metrics.span("store"):
+        for label in labels:
+            memory_manager.store_memory(label, active_neurons)
+    if consolidate:
+        with metrics.span("consolidate"):
+            memory_manager.consolidate_memory()
+    metrics.record_memory(network.xp)
+    return active_neurons, recalled
+
+
+def build_session(args, metrics):
+    """
+    스냅샷이 있으면 불러오고, 없으면 사용 가능한 메모리에 맞춰 네트워크를 새로 만듦.
+    (네트워크, 기억 관리자) 를 반환.
+    """
+    memory_options = {
+        "budget_bytes": int(args.memory_budget * 1024 * 1024),
+        "eviction_policy": args.eviction_policy,
+        "cold_path": args.cold_memory,
+    }
+    rewiring = {"rewire_interval": args.rewire_interval, "rewire_changed_only": args.rewire_changed_only}
+    if args.snapshot and os.path.exists(os.path.join(args.snapshot, MANIFEST_NAME)):
+        print(f"Loading network snapshot from {args.snapshot}...", file=sys.stderr)
+        network = load_network(args.snapshot, backend=args.backend, **rewiring)
+        memory_manager = MemoryManager(network, **memory_options)
+        load_memory(args.snapshot, memory_manager)
+    else:
+        # 할당하기 전에 사용 가능한 메모리에 맞는 크기를 정하고 알림
+        # 계획은 실제로 만들 네트워크와 같은 형식으로 크기를 추정
+        workers = os.cpu_count() or 1
+        dtypes = {"index_dtype": args.index_dtype, "weight_dtype": args.weight_dtype, "state_dtype": args.state_dtype}
+        plan = plan_network(args.min_connections, args.max_connections, max_neurons=args.neurons,
+                            backend=args.backend, workers=workers, **dtypes)
+        print(format_plan(plan), file=sys.stderr)
+        network = NeuronNetwork(
+            plan["num_neurons"], args.min_connections, args.max_connections, backend=args.backend,
+            seed=args.seed, workers=workers, progress=print_progress, **dtypes, **rewiring,
+        )
+        memory_manager = MemoryManager(network, **memory_options)
+    network.metrics = metrics
+    memory_manager.metrics = metrics
+    return network, memory_manager
+
+
+def save_checkpoint(path, network, memory_manager, metrics=NULL_METRICS):
+    """
+    네트워크와 장기 기억을 스냅샷으로 저장 (백그라운드 통합과 겹치지 않도록 잠금).
+    """
+    print(f"Saving network snapshot to {path}...", file=sys.stderr)
+    with metrics.span("checkpoint"), memory_manager.lock:
+        save_snapshot(path, network, memory_manager)
+
+
+def run_interactive(args, metrics):
+    """
+    콘솔 명령과 웹캠/마이크 입력을 받는 대화형 루프.
+    """
+    network, memory_manager = build_session(args, metrics)
+    retina_processor = RetinaProcessor(network)
+    cochlea_processor = CochleaProcessor(network)
+    text_processor = TextProcessor(network)
+    if args.consolidation_interval:
+        memory_manager.start_consolidation(args.consolidation_interval)
+
+    # 감각별 작업 스레드가 입력을 받는 동안 네트워크는 이전 입력을 처리
+    requests = {"image": queue.Queue(), "audio": queue.Queue()}
+    ingestion = SensoryIngestion(maxsize=8)
+    capture_image = metrics.timed("capture_image", retina_processor.capture_webcam)
+    capture_audio = metrics.timed("capture_audio", cochlea_processor.capture_microphone)
+    ingestion.add_source("text", console_commands(text_processor, requests, metrics))
+    ingestion.add_source("image", on_request(requests["image"], capture_image))
+    ingestion.add_source("audio", on_request(requests["audio"], capture_audio))
+
+    print("Neuron-based AI with dynamic synapses and memory is ready. Type 'exit' to quit.")
+    print("Commands: 'image', 'audio', 'text'")
+    ingestion.start()
+
+    for sources, input_signals in ingestion.ticks():
+        _, recalled = process_tick(network, memory_manager, sources, input_signals, metrics,
+                                   consolidate=not args.consolidation_interval, sprout=args.sprout)
+        if recalled:
+            print(f"AI: I remember you said: {recalled[0][0]}")
         else:
             print("AI: This is new to me.")
+        metrics.flush()
+
+    ingestion.stop()
+    retina_processor.close()
+    memory_manager.stop_consolidation()
+    if args.snapshot:
+        save_checkpoint(args.snapshot, network, memory_manager)
+    memory_manager.long_term_memory.close()
+
+
+def every(interval, tick):
+    """
+    interval틱마다 참 (0이면 항상 거짓).
+    """
+    return interval > 0 and tick % interval == 0
+
+
+def run_replay(args, metrics):
+    """
+    세션 스크립트나 녹화 입력 디렉터리를 대화형 루프와 같은 파이프라인으로 최대 속도로 재생.
+    틱마다 회상 결과와 단계별 시간을 JSON 한 줄로 쓰고, 마지막 줄에 전체 요약을 쓴다.
+    """
+    entries = replay_entries(args.replay)
+    recorder = RecordSink()  # 틱마다 단계별 시간을 결과와 함께 내보내기 위해 항상 계측
+    metrics = Metrics(metrics.sinks + [recorder])
+    network, memory_manager = build_session(args, metrics)
+    retina_processor = RetinaProcessor(network)
+    cochlea_processor = CochleaProcessor(network)
+    text_processor = TextProcessor(network)
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    start = time.perf_counter()
+    tick = 0
+    recalled_ticks = 0
+    try:
+        stimuli = replay_stimuli(entries, text_processor, cochlea_processor, retina_processor, metrics)
+        for tick, (kind, label, input_signals) in enumerate(stimuli, 1):
+            active_neurons, recalled = process_tick(
+                network, memory_manager, [label], input_signals, metrics,
+                learn=every(args.learn_every, tick), prune=every(args.prune_every, tick),
+                consolidate=every(args.consolidate_every, tick), top_k=args.top_k, sprout=args.sprout,
+            )
+            if args.snapshot and every(args.checkpoint_every, tick):
+                save_checkpoint(args.snapshot, network, memory_manager, metrics)
+            metrics.flush()
+            recalled_ticks += bool(recalled)
+            record = recorder.last
+            result = {
+                "tick": tick,
+                "kind": kind,
+                "input": label,
+                "active_neurons": int(len(active_neurons)),
+                "recalled": [{"input": text, "similarity": float(similarity)} for text, similarity in recalled],
+                "timings_ms": {name: sum(values) * 1000 for name, values in record["spans"].items()},
+                "counters": record["counters"],
+            }
+            output.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+        memory_manager.consolidate_memory()  # 주기에 걸리지 않고 남은 기억 통합
+        elapsed = time.perf_counter() - start
+        summary = {
+            "summary": {
+                "source": args.replay,
+                "ticks": tick,
+                "recalled_ticks": recalled_ticks,
+                "memories": len(memory_manager.long_term_memory),
+                "seconds": elapsed,
+                "ticks_per_s": tick / elapsed if elapsed > 0 else None,
+            }
+        }
+        output.write(json.dumps(summary, ensure_ascii=False) + "\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        retina_processor.close()
+
+    if args.snapshot:
+        save_checkpoint(args.snapshot, network, memory_manager)
+    memory_manager.long_term_memory.close()
+    metrics.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Neuron-based AI with dynamic synapses and memory. "
+                    "Runs an interactive session, or replays recorded inputs with --replay."
+    )
+    parser.add_argument("--replay", metavar="PATH",
+                        help="replay a session script or a directory of text/WAV/image/video files "
+                             "non-interactively instead of reading the console")
+    parser.add_argument("--neurons", type=int, default=1000000,
+                        help="maximum number of neurons, reduced to fit memory (default: 1000000)")
+    parser.add_argument("--min-connections", type=int, default=1000)
+    parser.add_argument("--max-connections", type=int, default=100000)
+    parser.add_argument("--backend", help="array backend (numpy/cupy, default: $NEURALCLOUD_BACKEND)")
+    parser.add_argument("--index-dtype", choices=("int64", "int32", "uint32"),
+                        default=os.environ.get("NEURALCLOUD_INDEX_DTYPE", "int64"),
+                        help="synapse target dtype (default: $NEURALCLOUD_INDEX_DTYPE or int64)")
+    parser.add_argument("--weight-dtype", choices=("float64", "float32", "float16", "uint8"),
+                        default=os.environ.get("NEURALCLOUD_WEIGHT_DTYPE", "float64"),
+                        help="synapse weight dtype, uint8 = quantized per row (default: $NEURALCLOUD_WEIGHT_DTYPE "
+                             "or float64)")
+    parser.add_argument("--state-dtype", choices=("float64", "float32"),
+                        default=os.environ.get("NEURALCLOUD_STATE_DTYPE", "float64"),
+                        help="threshold/membrane potential dtype (default: $NEURALCLOUD_STATE_DTYPE or float64)")
+    parser.add_argument("--seed", type=int, help="the same seed always builds the same network")
+    parser.add_argument("--snapshot", default=os.environ.get("NEURALCLOUD_SNAPSHOT"),
+                        help="load the network from this snapshot at start and save it at exit "
+                             "(default: $NEURALCLOUD_SNAPSHOT)")
+    parser.add_argument("--metrics", default=os.environ.get("NEURALCLOUD_METRICS"),
+                        help="metrics sinks, e.g. 'summary,jsonl:metrics.jsonl,prometheus:neuralcloud.prom' "
+                             "(default: $NEURALCLOUD_METRICS)")
+    parser.add_argument("--rewire-interval", type=int, default=1,
+                        help="prune and rewire every neuron on every Nth rewire call (default: 1)")
+    parser.add_argument("--rewire-changed-only", action="store_true",
+                        help="between full rewire passes, rewire only neurons whose weights were strengthened")
+    parser.add_argument("--sprout", type=int, default=0,
+                        help="new synapses each active neuron grows toward other active neurons per rewire "
+                             "(default: 0)")
+    parser.add_argument("--memory-budget", type=float, default=256,
+                        help="in-memory budget for long-term memories in MiB (default: 256)")
+    parser.add_argument("--eviction-policy", choices=("lru", "strength"), default="lru",
+                        help="which memories leave the budget first (default: lru)")
+    parser.add_argument("--cold-memory", metavar="PATH",
+                        help="SQLite file for memories evicted from the budget; without it they are forgotten")
+    parser.add_argument("--consolidation-interval", type=float,
+                        help="interactive: consolidate memories in a background thread every N seconds")
+    parser.add_argument("--learn-every", type=int, default=1,
+                        help="replay: update weights every N ticks, 0 = never (default: 1)")
+    parser.add_argument("--prune-every", type=int, default=1,
+                        help="replay: prune and rewire every N ticks, 0 = never (default: 1)")
+    parser.add_argument("--consolidate-every", type=int, default=1,
+                        help="replay: consolidate memories every N ticks, 0 = only at the end (default: 1)")
+    parser.add_argument("--checkpoint-every", type=int, default=0,
+                        help="replay: save the snapshot every N ticks, 0 = only at the end (default: 0)")
+    parser.add_argument("--top-k", type=int, default=5, help="replay: recalled memories per tick (default: 5)")
+    parser.add_argument("--output", help="replay: write JSON lines results to this file instead of stdout")
+    args = parser.parse_args(argv)
+    if args.checkpoint_every and not args.snapshot:
+        parser.error("--checkpoint-every requires --snapshot")
+    if args.rewire_interval < 1:
+        parser.error("--rewire-interval must be at least 1")
 
-        # 기억 저장 및 통합
-        memory_manager.store_memory(user_input, active_neurons)
-        memory_manager.consolidate_memory()
+    # 단계별 계측 (지정하지 않으면 비활성)
+    metrics = metrics_from_spec(args.metrics)
+    if args.replay:
+        run_replay(args, metrics)
+    else:
+        run_interactive(args, metrics)
+        metrics.close()
 
 
 if __name__ == "__main__":
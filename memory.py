@@ -1,33 +1,147 @@
+import threading
+
 import numpy as np
 
+from backend import asnumpy
+from memory_index import MinHashIndex
+from memory_store import MemoryStore
+from metrics import NULL_METRICS
+
 
 class MemoryManager:
-    def __init__(self, neuron_network):
+    def __init__(self, neuron_network, similarity_threshold=0.5, num_hashes=64, bands=32,
+                 budget_bytes=256 * 1024 * 1024, eviction_policy="lru", cold_path=None):
         self.network = neuron_network
-        self.long_term_memory = {}
+        self.similarity_threshold = similarity_threshold  # 기억으로 인정할 최소 Jaccard 유사도
+        # 장기 기억: 압축된 패턴과 입력을 예산 안에서 보관하고 넘치면 cold 저장소(SQLite)로 내보냄
+        # (패턴 id는 인덱스와 공유, 서명은 cold 기억도 메모리에 남아 계속 회상 가능)
+        self.long_term_memory = MemoryStore(
+            neuron_network.num_neurons, budget_bytes=budget_bytes, policy=eviction_policy, cold_path=cold_path
+        )
+        self.index = MinHashIndex(neuron_network.xp, num_hashes=num_hashes, bands=bands)
+
+        # 통합: 마지막 통합 이후 새로 저장되거나 다시 저장된 패턴 id만 처리
+        self.consolidation_strength = 0.05
+        self._pending = {}  # 순서를 유지하는 집합으로 사용
+        self._in_pattern = None
+        # 백그라운드 통합 스레드와 네트워크 가중치를 함께 다룰 때 쓰는 잠금
+        self.lock = threading.RLock()
+        self._consolidation_thread = None
+        self._stop_consolidation = threading.Event()
+        self.metrics = NULL_METRICS  # 계측기 (기억 수, 통합한 패턴 수, 서명 복사 동기화 기록)
 
-    def store_memory(self, input_text, active_neurons):
+    def store_memory(self, input_text, active_neurons, consolidate=True):
         """
         활성화된 뉴런 상태를 장기 기억으로 저장.
+        이미 같은 패턴이 있으면 입력만 갱신.
+        consolidate=False이면 통합 대상으로 표시하지 않음 (이미 통합된 기억을 스냅샷에서 복원할 때).
+        """
+        signature = self.index.signature(active_neurons)
+        pattern = np.sort(asnumpy(active_neurons).astype(np.uint32))
+        self.metrics.count("host_syncs", 2)  # 서명과 패턴을 호스트로 복사
+        with self.lock:
+            for pattern_id, similarity in self.index.query(signature, top_k=8, threshold=1.0):
+                if np.array_equal(self.long_term_memory.get(pattern_id)[0], pattern):
+                    self._forget(self.long_term_memory.reinforce(pattern_id, input_text))
+                    if consolidate:
+                        self._pending[pattern_id] = None  # 다시 경험한 기억은 한 번 더 강화
+                    return
+            pattern_id = self.index.add(signature)
+            if consolidate:
+                self._pending[pattern_id] = None
+            self._forget(self.long_term_memory.add(pattern_id, pattern, input_text))
+            self.metrics.gauge("memories", len(self.long_term_memory))
+            self.metrics.gauge("memory_hot_bytes", self.long_term_memory.hot_bytes)
+
+    def _forget(self, evicted):
+        """
+        cold 저장소 없이 내보낸 기억을 검색 대상에서 제외.
         """
-        pattern = tuple(active_neurons.tolist())
-        self.long_term_memory[pattern] = input_text
+        if self.long_term_memory.cold is None:
+            for pattern_id in evicted:
+                self.index.remove(pattern_id)
+                self._pending.pop(pattern_id, None)
+
+    def recall_memories(self, active_neurons, top_k=5, threshold=None):
+        """
+        활성화된 뉴런 상태와 비슷한 기억을 유사도 순으로 최대 top_k개 검색.
+        (입력, 유사도) 리스트를 반환.
+        """
+        if threshold is None:
+            threshold = self.similarity_threshold
+        signature = self.index.signature(active_neurons)
+        self.metrics.count("host_syncs")  # 서명을 호스트로 복사
+        with self.lock:
+            matches = self.index.query(signature, top_k=top_k, threshold=threshold)
+            recalled = [
+                (self.long_term_memory.get_text(pattern_id), similarity) for pattern_id, similarity in matches
+            ]
+            for pattern_id, _ in matches:
+                self._forget(self.long_term_memory.reinforce(pattern_id))  # 회상된 기억은 강해짐
+        return recalled
 
     def recall_memory(self, active_neurons):
         """
-        활성화된 뉴런 상태를 기반으로 기억 검색.
+        활성화된 뉴런 상태를 기반으로 가장 비슷한 기억 검색.
         """
-        pattern = tuple(active_neurons.tolist())
-        return self.long_term_memory.get(pattern, None)
+        matches = self.recall_memories(active_neurons, top_k=1)
+        return matches[0][0] if matches else None
 
     def consolidate_memory(self):
         """
         장기 기억 패턴 간의 연결 강화를 통해 통합.
+        마지막 통합 이후 새로 저장된 패턴만 처리하므로 기억이 쌓여도 호출당 비용은 일정하다.
+        처리한 패턴 수를 반환.
+        """
+        with self.lock:
+            pending = list(self._pending)
+            self._pending.clear()
+            self.metrics.count("memories_consolidated", len(pending))
+            for pattern_id in pending:
+                self._reinforce_pattern(self.long_term_memory.get(pattern_id)[0])
+        return len(pending)
+
+    def _reinforce_pattern(self, pattern):
+        """
+        패턴 안의 서로 다른 두 뉴런을 잇는 시냅스를 한 번의 gather/scatter로 강화.
+        """
+        network = self.network
+        xp = network.xp
+        synapses = network.synapses
+        if self._in_pattern is None:
+            self._in_pattern = xp.zeros(network.num_neurons, dtype=bool)
+
+        indices = xp.asarray(pattern, dtype=xp.int64)
+        self._in_pattern[indices] = True
+        positions, seg = synapses.row_positions(indices)
+        targets = synapses.targets[positions]
+        connected = self._in_pattern[targets] & (targets != indices[seg])
+        synapses.add_weight_values(positions[connected], indices, seg[connected], self.consolidation_strength)
+        self._in_pattern[indices] = False
+
+    def start_consolidation(self, interval=1.0):
+        """
+        interval초마다 consolidate_memory를 실행하는 백그라운드 스레드 시작.
+        네트워크를 갱신하는 쪽은 self.lock을 잡은 상태에서 갱신해야 한다.
+        """
+        if self._consolidation_thread is not None:
+            return
+        self._stop_consolidation.clear()
+
+        def run():
+            while not self._stop_consolidation.wait(interval):
+                self.consolidate_memory()
+
+        self._consolidation_thread = threading.Thread(target=run, name="memory-consolidation", daemon=True)
+        self._consolidation_thread.start()
+
+    def stop_consolidation(self):
+        """
+        백그라운드 통합 스레드를 멈추고 남은 패턴을 통합.
         """
-        for pattern in self.long_term_memory.keys():
-            indices = np.array(pattern)
-            for i in indices:
-                for j in indices:
-                    if i != j:
-                        connected_indices = self.network.connections[i] == j
-                        self.network.weights[i, connected_indices] += 0.05
+        if self._consolidation_thread is None:
+            return
+        self._stop_consolidation.set()
+        self._consolidation_thread.join()
+        self._consolidation_thread = None
+        self.consolidate_memory()
@@ -0,0 +1,113 @@
+import numpy as np
+
+from backend import asnumpy
+
+HASH_PRIME = (1 << 31) - 1  # 뉴런 인덱스(< 2^31)에 대한 범용 해시의 법
+EMPTY_HASH = HASH_PRIME  # 빈 패턴의 서명 값
+
+
+class MinHashIndex:
+    """
+    활성 뉴런 인덱스 집합의 MinHash 서명과 LSH 밴드 버킷으로 유사한 패턴을 찾는 인덱스.
+    두 서명에서 같은 값의 비율은 두 집합의 Jaccard 유사도의 추정치이며,
+    한 밴드라도 일치하는 패턴만 후보로 보므로 검색 시간은 저장된 패턴 수에 선형으로 늘지 않는다.
+    유사도 s인 패턴이 후보가 될 확률은 1 - (1 - s^r)^bands (r = 밴드당 행 수)이며,
+    기본값 32 x 2는 s = 0.5에서 0.9999, s = 0.3에서 0.95이다 (S곡선의 문턱 (1/bands)^(1/r) ≈ 0.18).
+    밴드당 행을 늘리면 후보가 줄어 빨라지지만 문턱이 올라가므로, 문턱이 query의 threshold보다
+    충분히 낮도록 고른다 (예: 16 x 4는 s = 0.5에서 0.64로 적합한 기억의 1/3을 놓친다).
+    """
+
+    def __init__(self, xp=np, num_hashes=64, bands=32, seed=0, block_size=65536):
+        if num_hashes % bands:
+            raise ValueError("num_hashes must be divisible by bands.")
+        self.xp = xp
+        self.num_hashes = num_hashes
+        self.bands = bands
+        self.rows_per_band = num_hashes // bands
+        self.block_size = block_size
+
+        rng = np.random.default_rng(seed)
+        self._a = xp.asarray(rng.integers(1, HASH_PRIME, num_hashes, dtype=np.uint64))
+        self._b = xp.asarray(rng.integers(0, HASH_PRIME, num_hashes, dtype=np.uint64))
+
+        self.signatures = np.zeros((0, num_hashes), dtype=np.uint32)  # 행 = 패턴 id
+        self.size = 0  # 사용한 적이 있는 행 수
+        self._free = []  # 제거된 패턴의 id (다음 add에서 재사용)
+        self.buckets = [{} for _ in range(bands)]  # 밴드 키 -> 패턴 id 리스트
+
+    def signature(self, indices):
+        """
+        뉴런 인덱스 집합의 MinHash 서명을 계산 (해시는 백엔드에서 계산하고 서명만 호스트로 복사).
+        """
+        xp = self.xp
+        indices = xp.asarray(indices).astype(xp.uint64)
+        result = xp.full(self.num_hashes, EMPTY_HASH, dtype=xp.uint64)
+        for start in range(0, len(indices), self.block_size):
+            block = indices[start:start + self.block_size, None]
+            hashes = (block * self._a + self._b) % HASH_PRIME
+            result = xp.minimum(result, hashes.min(axis=0))
+        return asnumpy(result).astype(np.uint32)
+
+    def candidate_probability(self, similarity):
+        """
+        Jaccard 유사도가 similarity인 패턴이 적어도 한 밴드를 공유해 후보가 될 확률.
+        """
+        return 1 - (1 - similarity ** self.rows_per_band) ** self.bands
+
+    def _band_keys(self, signature):
+        """
+        서명을 밴드별 버킷 키로 나눔.
+        """
+        return [band.tobytes() for band in signature.reshape(self.bands, self.rows_per_band)]
+
+    def add(self, signature):
+        """
+        서명을 인덱스에 추가하고 새 패턴 id를 반환.
+        제거된 패턴의 id와 서명 행을 먼저 재사용하므로 서명 배열은 동시에 들어 있는 패턴 수만큼만 커진다.
+        """
+        if self._free:
+            pattern_id = self._free.pop()
+        else:
+            if self.size == len(self.signatures):
+                grown = np.zeros((max(16, 2 * self.size), self.num_hashes), dtype=np.uint32)
+                grown[:self.size] = self.signatures[:self.size]
+                self.signatures = grown
+            pattern_id = self.size
+            self.size += 1
+        self.signatures[pattern_id] = signature
+        for bucket, key in zip(self.buckets, self._band_keys(signature)):
+            bucket.setdefault(key, []).append(pattern_id)
+        return pattern_id
+
+    def remove(self, pattern_id):
+        """
+        패턴을 검색 대상에서 제외하고 id를 재사용 대상으로 돌려놓음.
+        """
+        removed = False
+        for bucket, key in zip(self.buckets, self._band_keys(self.signatures[pattern_id])):
+            members = bucket.get(key)
+            if members is not None and pattern_id in members:
+                members.remove(pattern_id)
+                removed = True
+                if not members:
+                    del bucket[key]
+        if removed:
+            self._free.append(pattern_id)
+
+    def query(self, signature, top_k=1, threshold=0.5):
+        """
+        유사도가 threshold 이상인 패턴을 유사도가 높은 순으로 최대 top_k개 반환.
+
+        반환값은 (패턴 id, 추정 Jaccard 유사도) 리스트.
+        """
+        candidates = set()
+        for bucket, key in zip(self.buckets, self._band_keys(signature)):
+            candidates.update(bucket.get(key, ()))
+        if not candidates:
+            return []
+        ids = np.sort(np.fromiter(candidates, dtype=np.int64, count=len(candidates)))
+        similarity = (self.signatures[ids] == signature).mean(axis=1)
+        keep = similarity >= threshold
+        ids, similarity = ids[keep], similarity[keep]
+        order = np.argsort(-similarity, kind="stable")[:top_k]
+        return [(int(ids[i]), float(similarity[i])) for i in order]
@@ -0,0 +1,197 @@
+import sqlite3
+from collections import OrderedDict
+
+import numpy as np
+
+DELTA_DTYPES = (np.uint8, np.uint16, np.uint32)
+
+
+def encode_pattern(pattern, num_neurons):
+    """
+    정렬된 뉴런 인덱스 패턴을 더 작은 쪽의 형식으로 압축.
+    - 'delta': 인접 인덱스 차이를 담을 수 있는 가장 작은 정수형(uint8/16/32)으로 저장
+    - 'bitmap': 뉴런마다 1비트 (패턴이 조밀할 때)
+    (형식, 바이트열)을 반환.
+    """
+    pattern = np.asarray(pattern, dtype=np.uint32)
+    deltas = np.diff(pattern, prepend=np.uint32(0))
+    largest = int(deltas.max()) if len(deltas) else 0
+    dtype = next(t for t in DELTA_DTYPES if largest <= np.iinfo(t).max)
+    delta_size = len(deltas) * np.dtype(dtype).itemsize
+    bitmap_size = (num_neurons + 7) // 8
+    if bitmap_size < delta_size:
+        mask = np.zeros(num_neurons, dtype=bool)
+        mask[pattern] = True
+        return "bitmap", np.packbits(mask).tobytes()
+    return f"delta{np.dtype(dtype).itemsize * 8}", deltas.astype(dtype).tobytes()
+
+
+def decode_pattern(encoding, payload, num_neurons):
+    """
+    encode_pattern으로 압축한 패턴을 정렬된 uint32 인덱스 배열로 복원.
+    """
+    if encoding == "bitmap":
+        mask = np.unpackbits(np.frombuffer(payload, dtype=np.uint8), count=num_neurons)
+        return np.flatnonzero(mask).astype(np.uint32)
+    dtype = {"delta8": np.uint8, "delta16": np.uint16, "delta32": np.uint32}[encoding]
+    return np.cumsum(np.frombuffer(payload, dtype=dtype), dtype=np.uint32)
+
+
+class MemoryStore:
+    """
+    용량 예산이 있는 장기 기억 저장소.
+    압축된 패턴과 입력은 메모리(hot)에 두고, 예산을 넘으면 정책에 따라 오래되거나 약한 기억을
+    SQLite 파일(cold)로 내보낸다. cold 저장소가 없으면 내보낸 기억은 잊혀진다.
+    - policy='lru': 가장 오랫동안 쓰이지 않은 기억부터 내보냄
+    - policy='strength': 다시 저장·회상된 횟수(강도)가 낮은 기억부터 내보냄
+    """
+
+    def __init__(self, num_neurons, budget_bytes=256 * 1024 * 1024, policy="lru", cold_path=None):
+        if policy not in ("lru", "strength"):
+            raise ValueError(f"Unknown eviction policy: {policy!r} (expected 'lru' or 'strength').")
+        self.num_neurons = num_neurons
+        self.budget_bytes = budget_bytes
+        self.policy = policy
+        self.hot = OrderedDict()  # id -> [형식, 바이트열, 입력, 강도], 최근 사용 순
+        self.hot_bytes = 0
+        self.cold = None
+        self._cold_count = 0  # cold 저장소의 기억 수 (기억을 저장할 때마다 세지 않도록 직접 관리)
+        if cold_path is not None:
+            self.cold = sqlite3.connect(cold_path, check_same_thread=False)
+            self.cold.execute(
+                "CREATE TABLE IF NOT EXISTS memories ("
+                "id INTEGER PRIMARY KEY, encoding TEXT, payload BLOB, text TEXT, strength INTEGER)"
+            )
+            self._cold_count = self.cold.execute("SELECT COUNT(*) FROM memories").fetchone()[0]
+
+    def __len__(self):
+        return len(self.hot) + self.cold_count()
+
+    def __contains__(self, memory_id):
+        return memory_id in self.hot or self._load_cold(memory_id) is not None
+
+    def cold_count(self):
+        """
+        cold 저장소에 있는 기억 수.
+        """
+        return self._cold_count
+
+    def ids(self):
+        """
+        저장된 모든 기억 id (hot, cold 순).
+        """
+        ids = list(self.hot)
+        if self.cold is not None:
+            ids += [row[0] for row in self.cold.execute("SELECT id FROM memories ORDER BY id")]
+        return ids
+
+    @staticmethod
+    def _entry_bytes(entry):
+        return len(entry[1]) + len(entry[2].encode("utf-8"))
+
+    def add(self, memory_id, pattern, text):
+        """
+        기억을 hot 저장소에 추가하고, 예산을 넘으면 내보낼 기억의 id 리스트를 반환.
+        cold 저장소가 없으면 반환된 기억은 잊혀진 것이다.
+        """
+        encoding, payload = encode_pattern(pattern, self.num_neurons)
+        self._put(memory_id, [encoding, payload, text, 1])
+        return self._evict()
+
+    def _put(self, memory_id, entry):
+        self.hot[memory_id] = entry
+        self.hot_bytes += self._entry_bytes(entry)
+
+    def _load_cold(self, memory_id):
+        if self.cold is None:
+            return None
+        row = self.cold.execute(
+            "SELECT encoding, payload, text, strength FROM memories WHERE id = ?", (memory_id,)
+        ).fetchone()
+        return None if row is None else [row[0], bytes(row[1]), row[2], row[3]]
+
+    def _entry(self, memory_id, promote):
+        """
+        기억 항목을 찾음. cold에 있으면 읽어오고, promote이면 hot으로 다시 올린다.
+        """
+        entry = self.hot.get(memory_id)
+        if entry is not None:
+            self.hot.move_to_end(memory_id)
+            return entry
+        entry = self._load_cold(memory_id)
+        if entry is None:
+            raise KeyError(memory_id)
+        if promote:
+            self.cold.execute("DELETE FROM memories WHERE id = ?", (memory_id,))
+            self._cold_count -= 1
+            self._put(memory_id, entry)
+        return entry
+
+    def get(self, memory_id, promote=False):
+        """
+        (정렬된 uint32 패턴, 입력)을 반환.
+        """
+        encoding, payload, text, _ = self._entry(memory_id, promote)
+        return decode_pattern(encoding, payload, self.num_neurons), text
+
+    def get_text(self, memory_id):
+        """
+        기억의 입력을 반환.
+        """
+        return self._entry(memory_id, promote=False)[2]
+
+    def reinforce(self, memory_id, text=None):
+        """
+        기억이 다시 저장되거나 회상되었음을 기록 (강도 증가, 최근 사용으로 이동, cold면 hot으로 복귀).
+        text를 주면 입력도 갱신. 예산 초과로 내보낸 기억 id 리스트를 반환.
+        """
+        entry = self._entry(memory_id, promote=True)
+        if text is not None:
+            self.hot_bytes -= self._entry_bytes(entry)
+            entry[2] = text
+            self.hot_bytes += self._entry_bytes(entry)
+        entry[3] += 1
+        return self._evict(keep=memory_id)
+
+    def _evict(self, keep=None):
+        """
+        hot 저장소가 예산을 넘으면 예산의 90%까지 기억을 내보냄.
+        """
+        if self.hot_bytes <= self.budget_bytes:
+            return []
+        if self.policy == "lru":
+            candidates = list(self.hot)
+        else:
+            # 강도가 낮은 순, 같으면 오래 쓰이지 않은 순
+            order = {memory_id: rank for rank, memory_id in enumerate(self.hot)}
+            candidates = sorted(self.hot, key=lambda memory_id: (self.hot[memory_id][3], order[memory_id]))
+
+        target = self.budget_bytes * 0.9
+        evicted = []
+        for memory_id in candidates:
+            if self.hot_bytes <= target:
+                break
+            if memory_id == keep:
+                continue
+            entry = self.hot.pop(memory_id)
+            self.hot_bytes -= self._entry_bytes(entry)
+            if self.cold is not None:
+                self.cold.execute(
+                    "INSERT OR REPLACE INTO memories VALUES (?, ?, ?, ?, ?)",
+                    (memory_id, entry[0], entry[1], entry[2], entry[3]),
+                )
+                self._cold_count += 1  # hot과 cold는 겹치지 않음 (hot으로 올릴 때 cold에서 지움)
+            evicted.append(memory_id)
+        if self.cold is not None:
+            self.cold.commit()
+        return evicted
+
+    def close(self):
+        """
+        cold 저장소 연결을 닫음.
+        """
+        if self.cold is not None:
+            self.cold.commit()
+            self.cold.close()
+            self.cold = None
+            self._cold_count = 0
@@ -0,0 +1,272 @@
+import json
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+from backend import backend_name
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class Metrics:
+    """
+    단계별 시간(span), 누적 횟수(counter), 현재 값(gauge)을 모아 flush()마다 싱크로 내보내는 계측기.
+    여러 스레드에서 기록할 수 있다. enabled=False이면 모든 기록 메서드가 아무것도 하지 않으며
+    span()은 공유 no-op 컨텍스트를 반환하므로 비활성 상태의 비용은 메서드 호출 한 번이다.
+    """
+
+    def __init__(self, sinks=(), enabled=True):
+        self.sinks = list(sinks)
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.spans = {}  # 이름 -> 이번 구간의 소요 시간(초) 리스트
+        self.counters = {}
+        self.gauges = {}
+
+    def span(self, name):
+        """
+        with 블록의 실행 시간을 name으로 기록하는 컨텍스트.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def timed(self, name, function):
+        """
+        호출할 때마다 실행 시간을 name으로 기록하는 함수로 감쌈 (비활성이면 function 그대로).
+        """
+        if not self.enabled:
+            return function
+
+        def wrapper(*args, **kwargs):
+            with self.span(name):
+                return function(*args, **kwargs)
+        return wrapper
+
+    def observe(self, name, seconds):
+        """
+        span 소요 시간을 직접 기록.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self.spans.setdefault(name, []).append(seconds)
+
+    def count(self, name, value=1):
+        """
+        카운터 name을 value만큼 증가.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def gauge(self, name, value):
+        """
+        게이지 name의 현재 값을 기록.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self.gauges[name] = value
+
+    def record_memory(self, xp=np):
+        """
+        호스트 상주 메모리와 (cupy 백엔드이면) 장치 메모리 풀 사용량을 게이지로 기록.
+        """
+        if not self.enabled:
+            return
+        try:
+            with open("/proc/self/statm", encoding="ascii") as f:
+                self.gauge("host_rss_bytes", int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE"))
+        except OSError:
+            pass
+        if backend_name(xp) == "cupy":
+            pool = xp.get_default_memory_pool()
+            self.gauge("device_used_bytes", pool.used_bytes())
+            self.gauge("device_pool_bytes", pool.total_bytes())
+
+    def flush(self):
+        """
+        지금까지 기록한 값을 하나의 레코드로 모든 싱크에 보내고 비움.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            record = {"time": time.time(), "spans": self.spans, "counters": self.counters, "gauges": self.gauges}
+            self._reset()
+        for sink in self.sinks:
+            sink.write(record)
+
+    def close(self):
+        """
+        남은 값을 내보내고 싱크를 닫음.
+        """
+        self.flush()
+        for sink in self.sinks:
+            sink.close()
+
+
+NULL_METRICS = Metrics(enabled=False)  # 계측하지 않을 때 쓰는 공유 인스턴스
+
+
+class JsonLinesSink:
+    """
+    flush마다 레코드 한 줄(JSON)을 파일에 덧붙이는 싱크.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, "a", encoding="utf-8")
+
+    def write(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class SummarySink:
+    """
+    모든 레코드를 누적해 단계별 시간 통계와 카운터 합계를 표로 보여주는 싱크.
+    print_on_close이면 close()에서 표를 stream(기본값은 표준 에러)에 출력한다.
+    표준 출력으로 내보내는 결과(예: 재생 모드의 JSON lines)와 섞이지 않게 하기 위함이다.
+    """
+
+    def __init__(self, print_on_close=True, stream=None):
+        self.print_on_close = print_on_close
+        self.stream = stream
+        self.spans = {}
+        self.counters = {}
+        self.gauges = {}
+
+    def write(self, record):
+        for name, values in record["spans"].items():
+            self.spans.setdefault(name, []).extend(values)
+        for name, value in record["counters"].items():
+            self.counters[name] = self.counters.get(name, 0) + value
+        self.gauges.update(record["gauges"])
+
+    def format(self):
+        """
+        누적 통계를 표 문자열로 변환.
+        """
+        lines = [f"{'phase':<24}{'count':>8}{'total s':>10}{'mean ms':>10}{'p95 ms':>10}{'max ms':>10}"]
+        for name, values in sorted(self.spans.items(), key=lambda item: -sum(item[1])):
+            values = np.array(values) * 1000
+            lines.append(f"{name:<24}{len(values):>8}{values.sum() / 1000:>10.3f}{values.mean():>10.2f}"
+                         f"{np.percentile(values, 95):>10.2f}{values.max():>10.2f}")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"{name:<24}{value:>8}")
+        for name, value in sorted(self.gauges.items()):
+            lines.append(f"{name:<24}{value:>18}")
+        return "\n".join(lines)
+
+    def close(self):
+        if self.print_on_close:
+            print(self.format(), file=self.stream or sys.stderr, flush=True)
+
+
+class RecordSink:
+    """
+    마지막으로 받은 레코드를 last에 보관하는 싱크 (틱마다 시간을 결과와 함께 내보낼 때 사용).
+    """
+
+    def __init__(self):
+        self.last = None
+
+    def write(self, record):
+        self.last = record
+
+    def close(self):
+        pass
+
+
+class PrometheusSink:
+    """
+    누적값을 Prometheus 텍스트 형식 파일로 다시 쓰는 싱크 (node_exporter textfile 수집기용).
+    파일은 임시 파일에 쓴 뒤 교체하므로 수집기가 반쯤 쓰인 파일을 읽지 않는다.
+    """
+
+    def __init__(self, path, prefix="neuralcloud"):
+        self.path = path
+        self.prefix = prefix
+        self.span_count = {}
+        self.span_sum = {}
+        self.counters = {}
+        self.gauges = {}
+
+    def write(self, record):
+        for name, values in record["spans"].items():
+            self.span_count[name] = self.span_count.get(name, 0) + len(values)
+            self.span_sum[name] = self.span_sum.get(name, 0.0) + sum(values)
+        for name, value in record["counters"].items():
+            self.counters[name] = self.counters.get(name, 0) + value
+        self.gauges.update(record["gauges"])
+
+        prefix = self.prefix
+        lines = [f"# TYPE {prefix}_phase_seconds summary"]
+        for name in sorted(self.span_sum):
+            lines.append(f'{prefix}_phase_seconds_sum{{phase="{name}"}} {self.span_sum[name]}')
+            lines.append(f'{prefix}_phase_seconds_count{{phase="{name}"}} {self.span_count[name]}')
+        for name, value in sorted(self.counters.items()):
+            lines += [f"# TYPE {prefix}_{name}_total counter", f"{prefix}_{name}_total {value}"]
+        for name, value in sorted(self.gauges.items()):
+            lines += [f"# TYPE {prefix}_{name} gauge", f"{prefix}_{name} {value}"]
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(temp_path, self.path)
+
+    def close(self):
+        pass
+
+
+def metrics_from_spec(spec):
+    """
+    'summary', 'jsonl:경로', 'prometheus:경로'를 쉼표로 이은 설정 문자열로 Metrics 생성.
+    spec이 비어 있으면 NULL_METRICS.
+    """
+    if not spec:
+        return NULL_METRICS
+    sinks = []
+    for item in spec.split(","):
+        kind, _, path = item.strip().partition(":")
+        if kind == "summary":
+            sinks.append(SummarySink())
+        elif kind == "jsonl" and path:
+            sinks.append(JsonLinesSink(path))
+        elif kind == "prometheus" and path:
+            sinks.append(PrometheusSink(path))
+        else:
+            raise ValueError(f"Unknown metrics sink: {item!r} (expected summary, jsonl:PATH or prometheus:PATH).")
+    return Metrics(sinks)
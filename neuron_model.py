@@ -1,90 +1,449 @@
-import cupy as cp
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from backend import get_array_module, scatter_add, seeded_random
+from metrics import NULL_METRICS
+from synapse_store import GROWTH_SLACK, SynapseStore, quantize_rows
+
+SEED_CHUNK = 4096  # 난수 시드를 나누는 뉴런 단위 (블록 크기·작업자 수와 무관하게 같은 네트워크 생성)
+INDEX_DTYPES = tuple(np.dtype(t) for t in (np.int64, np.int32, np.uint32))  # 시냅스 타깃 인덱스 형식
+WEIGHT_DTYPES = tuple(np.dtype(t) for t in (np.float64, np.float32, np.float16, np.uint8))  # uint8은 행별 scale 양자화
+
+
+def generate_neuron_block(seed, start, stop, num_neurons, num_connections):
+    """
+    뉴런 [start, stop) 구간의 역치와 시냅스를 호스트(numpy)에서 생성.
+    SEED_CHUNK마다 (seed, 청크 번호)로 난수 생성기를 만들므로 어떤 순서나 구간으로 나눠 생성해도 결과가 같다
+    (구간 경계가 청크 중간이면 그 청크를 생성한 뒤 잘라낸다).
+    """
+    thresholds, targets, weights = [], [], []
+    for chunk in range(start // SEED_CHUNK, -(-stop // SEED_CHUNK)):
+        chunk_start = chunk * SEED_CHUNK
+        count = min(SEED_CHUNK, num_neurons - chunk_start)
+        rng = np.random.default_rng([seed, chunk])
+        low, high = max(start, chunk_start) - chunk_start, min(stop, chunk_start + count) - chunk_start
+        thresholds.append(rng.uniform(-50, -30, count)[low:high])
+        targets.append(rng.integers(0, num_neurons, count * num_connections)[low * num_connections:
+                                                                             high * num_connections])
+        weights.append(rng.uniform(0.1, 1.0, count * num_connections)[low * num_connections:high * num_connections])
+    return start, stop, np.concatenate(thresholds), np.concatenate(targets), np.concatenate(weights)
+
+
+def generation_window(block_size, workers=1):
+    """
+    초기화 중 한꺼번에 메모리에 있을 수 있는 블록의 (블록당 뉴런 수, 블록 수).
+    작업자가 여러 개면 블록을 작업자 수만큼 잘게 나누고 대기 블록 수도 제한하므로,
+    생성 중인 블록 전체는 작업자 수와 관계없이 block_size의 약 2배 이내다.
+    """
+    step = -(-block_size // max(workers, 1))
+    step = -(-step // SEED_CHUNK) * SEED_CHUNK  # SEED_CHUNK의 배수로 올림
+    if workers <= 1:
+        return step, 1
+    return step, max(2, min(workers + 1, 2 * block_size // step))
+
+
+def iter_neuron_blocks(seed, num_neurons, num_connections, block_size, workers=1, start=0, stop=None):
+    """
+    뉴런 [start, stop) 구간(기본값 전체)의 블록을 순서대로 생성하는 제너레이터.
+    workers > 1이면 작업자 프로세스에서 병렬로 생성하되, 블록 크기와 대기 중인 블록 수를
+    generation_window로 제한해 메모리를 묶어 둔다.
+    """
+    stop = num_neurons if stop is None else stop
+    block_size, window = generation_window(block_size, workers)
+    bounds = [(first, min(first + block_size, stop)) for first in range(start, stop, block_size)]
+    if workers <= 1:
+        for first, last in bounds:
+            yield generate_neuron_block(seed, first, last, num_neurons, num_connections)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = []
+        for first, last in bounds:
+            pending.append(executor.submit(generate_neuron_block, seed, first, last, num_neurons, num_connections))
+            if len(pending) >= window:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+def check_dtypes(num_neurons, index_dtype, weight_dtype):
+    """
+    시냅스 타깃/가중치 형식이 지원되는지, 타깃 형식이 num_neurons개의 뉴런을 가리킬 수 있는지 확인.
+    """
+    index_dtype, weight_dtype = np.dtype(index_dtype), np.dtype(weight_dtype)
+    if index_dtype not in INDEX_DTYPES or num_neurons > np.iinfo(index_dtype).max:
+        raise ValueError(f"Index dtype {index_dtype} cannot address {num_neurons} neurons.")
+    if weight_dtype not in WEIGHT_DTYPES:
+        raise ValueError(f"Unsupported weight dtype {weight_dtype} (expected one of {WEIGHT_DTYPES}).")
+
+
+def generate_neurons(xp, seed, num_neurons, min_connections, start=0, stop=None, block_size=65536, workers=1,
+                     progress=None, index_dtype=np.int64, weight_dtype=np.float64, state_dtype=np.float64):
+    """
+    뉴런 [start, stop) 구간의 역치와 나가는 시냅스 저장소를 블록 단위로 생성해 최대 메모리 사용량을 제한.
+    저장소의 행 번호는 start 기준이고 시냅스 타깃은 전체 뉴런 공간 [0, num_neurons)을 가리킨다.
+    (역치, SynapseStore)를 반환.
+    """
+    stop = num_neurons if stop is None else stop
+    count = stop - start
+    threshold = xp.empty(count, dtype=state_dtype)
+    connections = xp.empty((count, min_connections), dtype=index_dtype)
+    weights = xp.empty((count, min_connections), dtype=weight_dtype)
+    quantized = np.dtype(weight_dtype) == np.uint8
+    row_scale = xp.empty(count, dtype=xp.float32) if quantized else None
+    blocks = iter_neuron_blocks(seed, num_neurons, min_connections, block_size, workers, start, stop)
+    for first, last, thresholds, targets, block_weights in blocks:
+        rows = slice(first - start, last - start)
+        threshold[rows] = xp.asarray(thresholds)
+        connections[rows] = xp.asarray(targets).reshape(last - first, min_connections)
+        block_weights = xp.asarray(block_weights).reshape(last - first, min_connections)
+        if quantized:
+            weights[rows], row_scale[rows] = quantize_rows(xp, block_weights)
+        else:
+            weights[rows] = block_weights
+        if progress is not None:
+            progress(last - start, count)
+    # 뉴런마다 길이가 변하는 CSR 저장소
+    return threshold, SynapseStore.from_dense(connections, weights, xp, row_scale, num_targets=num_neurons)
+
+
+_fire_kernels = {}
+
+
+def fire_neurons(xp, potential, threshold, leak=1.0):
+    """
+    역치 비교(탈분극), 재분극, 막전위 누설을 한 번에 처리하고 활성화 여부 배열을 반환.
+    potential은 제자리에서 갱신된다. CuPy에서는 하나의 elementwise 커널로 융합한다.
+    """
+    if xp is np:
+        spikes = potential >= threshold
+        if leak != 1.0:
+            potential *= leak
+        potential[spikes] = 0
+        return spikes
+
+    kernel = _fire_kernels.get(xp)
+    if kernel is None:
+        kernel = xp.ElementwiseKernel(
+            "T threshold, T leak",
+            "T potential, bool spike",
+            "spike = potential >= threshold; potential = spike ? (T)0 : potential * leak;",
+            "neuralcloud_fire",
+        )
+        _fire_kernels[xp] = kernel
+    spikes = xp.empty(potential.shape, dtype=bool)
+    kernel(threshold, leak, potential, spikes)
+    return spikes
 
 
 class NeuronNetwork:
-    def __init__(self, num_neurons, min_connections=1000, max_connections=100000):
+    def __init__(self, num_neurons, min_connections=1000, max_connections=100000, backend=None,
+                 rewire_interval=1, rewire_changed_only=False, seed=None, block_size=65536, workers=1,
+                 progress=None, propagation_mode="auto", dense_activity=0.3, index_dtype="int64",
+                 weight_dtype="float64", state_dtype="float64"):
+        self.xp = get_array_module(backend)  # numpy(CPU) 또는 cupy(GPU)
+        xp = self.xp
+        check_dtypes(num_neurons, index_dtype, weight_dtype)
         self.num_neurons = num_neurons
         self.min_connections = min_connections
         self.max_connections = max_connections
+        # 같은 (seed, num_neurons, min/max_connections)이면 항상 같은 네트워크가 만들어진다
+        self.seed = seed if seed is not None else np.random.SeedSequence().entropy
+
+        # 뉴런 상태 및 시냅스 연결 초기화 (역치, 블록 단위로 생성한 시냅스)
+        self.threshold, self.synapses = generate_neurons(
+            xp, self.seed, num_neurons, min_connections, block_size=block_size, workers=workers, progress=progress,
+            index_dtype=index_dtype, weight_dtype=weight_dtype, state_dtype=state_dtype,
+        )
+        self.membrane_potential = xp.zeros(num_neurons, dtype=state_dtype)  # 초기 막전위
+        self.active_state = xp.zeros(num_neurons, dtype=bool)  # 활성화 상태
+        self._init_random()
 
-        # 뉴런 상태 초기화
-        self.threshold = cp.random.uniform(-50, -30, size=num_neurons)  # 역치
-        self.membrane_potential = cp.zeros(num_neurons)  # 초기 막전위
-        self.active_state = cp.zeros(num_neurons, dtype=bool)  # 활성화 상태
+        self._init_rewiring(rewire_interval, rewire_changed_only)
+        self._init_propagation(propagation_mode, dense_activity)
+        self.metrics = NULL_METRICS  # 계측기 (metrics.Metrics를 지정하면 발화/시냅스 수를 기록)
 
-        # 시냅스 연결 초기화
-        self.connections = cp.random.randint(0, num_neurons, (num_neurons, min_connections))
-        self.weights = cp.random.uniform(0.1, 1.0, (num_neurons, min_connections))
+    @classmethod
+    def from_state(cls, threshold, synapses, min_connections, max_connections, backend=None,
+                   membrane_potential=None, active_state=None, seed=None,
+                   rewire_interval=1, rewire_changed_only=False, propagation_mode="auto", dense_activity=0.3):
+        """
+        저장된 상태(역치, 막전위, 시냅스 저장소)로 네트워크를 구성 (무작위 초기화 없음).
+        """
+        network = cls.__new__(cls)
+        network.xp = get_array_module(backend)
+        xp = network.xp
+        network.num_neurons = len(threshold)
+        network.min_connections = min_connections
+        network.max_connections = max_connections
+        network.seed = seed
+        network.threshold = threshold
+        if membrane_potential is None:
+            membrane_potential = xp.zeros(network.num_neurons, dtype=threshold.dtype)
+        if active_state is None:
+            active_state = xp.zeros(network.num_neurons, dtype=bool)
+        network.membrane_potential = membrane_potential
+        network.active_state = active_state
+        network.synapses = synapses
+        network._init_random()
+        network._init_rewiring(rewire_interval, rewire_changed_only)
+        network._init_propagation(propagation_mode, dense_activity)
+        network.metrics = NULL_METRICS
+        return network
+
+    def _init_random(self):
+        """
+        재연결과 확률적 반올림에 쓸 난수 생성기를 seed에서 유도 (같은 seed와 입력이면 같은 결과).
+        """
+        self.rng = seeded_random(self.xp, self.seed, 0)
+        self.synapses.rng = self.rng
+
+    def _init_rewiring(self, rewire_interval, rewire_changed_only):
+        """
+        구조적 가소성(가지치기/재연결) 주기 설정: rewire_interval번 호출마다 전체 뉴런을 처리하고,
+        rewire_changed_only이면 그 사이에는 가중치가 강화된 뉴런만 처리.
+        """
+        self.rewire_interval = rewire_interval
+        self.rewire_changed_only = rewire_changed_only
+        self._rewire_counter = 0
+        self._changed_rows = self.xp.zeros(self.num_neurons, dtype=bool)
+
+    def _init_propagation(self, propagation_mode, dense_activity):
+        """
+        신호 전달 방식 설정.
+        - 'sparse': 이벤트 기반. 발화한 뉴런의 시냅스만 처리
+        - 'dense': 전체 시냅스 풀을 한 번에 처리
+        - 'auto': 틱마다 측정한 활성 비율이 dense_activity 이상이면 dense, 아니면 sparse
+        """
+        if propagation_mode not in ("auto", "sparse", "dense"):
+            raise ValueError(f"Unknown propagation mode: {propagation_mode!r}.")
+        self.propagation_mode = propagation_mode
+        self.dense_activity = dense_activity
+        self.activity_fraction = 0.0  # 마지막 틱의 활성 뉴런 비율
+
+    def _propagate(self, active_indices):
+        """
+        발화한 뉴런의 신호를 포스트뉴런 입력으로 계산 (활성 비율에 따라 sparse/dense 경로 선택).
+        """
+        self.activity_fraction = len(active_indices) / self.num_neurons
+        mode = self.propagation_mode
+        if mode == "auto":
+            mode = "dense" if self.activity_fraction >= self.dense_activity else "sparse"
+        metrics = self.metrics
+        metrics.count("spikes", len(active_indices))
+        metrics.count("host_syncs")  # 활성 인덱스 수를 알기 위한 동기화
+        if metrics.enabled:
+            touched = self.synapses.nnz if mode == "dense" else int(self.synapses.row_lengths(active_indices).sum())
+            metrics.count("synapses_propagated", touched)
+        if mode == "dense":
+            return self.synapses.propagate_dense(self.active_state)
+        return self.synapses.propagate(active_indices)
 
     def stimulate_neurons(self, input_signals):
         """
         뉴런을 외부 신호로 자극.
+        input_signals는 길이 num_neurons의 신호 배열 또는 (인덱스, 값) 희소 자극.
+        희소 자극은 해당 뉴런에만 scatter-add 하므로 전체 길이 배열을 만들거나 전송하지 않는다.
         """
-        self.membrane_potential += input_signals
+        xp = self.xp
+        if isinstance(input_signals, tuple):
+            indices, values = input_signals
+            scatter_add(xp, self.membrane_potential, xp.asarray(indices), xp.asarray(values))
+        else:
+            self.membrane_potential += xp.asarray(input_signals)
 
     def update_neurons(self):
         """
         뉴런 상태를 업데이트: 탈분극, 재분극, 신호 전달.
         """
-        # 역치를 초과한 뉴런을 활성화
-        self.active_state = self.membrane_potential >= self.threshold
-
-        # 활성화된 뉴런의 막전위를 초기화 (재분극)
-        self.membrane_potential[self.active_state] = 0
+        # 역치를 초과한 뉴런을 활성화하고 막전위를 초기화 (재분극)
+        self.active_state = fire_neurons(self.xp, self.membrane_potential, self.threshold)
 
-        # 활성화된 뉴런이 신호를 전달
-        outgoing_signals = cp.zeros_like(self.membrane_potential)
-        outgoing_signals[self.active_state] = 1  # 활성화된 뉴런에서 신호 출력
+        # 활성화된 뉴런(출력 1)의 행만 모아 희소 행렬-벡터 곱으로 신호 전달
+        active_indices = self.xp.flatnonzero(self.active_state)
+        self.membrane_potential += self._propagate(active_indices)
 
-        # 연결된 뉴런으로 신호 전달
-        for i in range(self.connections.shape[1]):
-            target_indices = self.connections[:, i]
-            self.membrane_potential[target_indices] += outgoing_signals * self.weights[:, i]
+    def simulate(self, steps, until_quiescent=True, leak=1.0):
+        """
+        update_neurons를 여러 틱 연속으로 실행해 활동이 여러 시냅스 단계를 거쳐 퍼지게 함.
+        틱마다 융합된 발화/재분극/누설 커널과 활성 행 전파만 실행하며,
+        until_quiescent이면 발화한 뉴런이 없는 틱에서 멈춘다.
+        leak은 발화하지 않은 뉴런의 막전위에 틱마다 곱하는 누설 계수 (1.0이면 누설 없음).
+        {"ticks": 실행한 틱 수, "spikes_per_tick": 틱별 발화 뉴런 수}를 반환.
+        """
+        xp = self.xp
+        spikes_per_tick = []
+        for _ in range(steps):
+            self.active_state = fire_neurons(xp, self.membrane_potential, self.threshold, leak)
+            active_indices = xp.flatnonzero(self.active_state)
+            spikes_per_tick.append(len(active_indices))  # 활성 인덱스를 구할 때 이미 동기화됨
+            if until_quiescent and not len(active_indices):
+                break
+            self.membrane_potential += self._propagate(active_indices)
+        return {"ticks": len(spikes_per_tick), "spikes_per_tick": spikes_per_tick}
 
-    def update_weights(self):
+    def update_weights(self, learning_rate=0.1, decay=0.99):
         """
         Hebbian Learning을 기반으로 연결 강도를 업데이트.
+        프리/포스트 뉴런이 함께 활성화된 연결은 강화하고 나머지 연결은 약화.
         """
-        active_indices = cp.where(self.active_state)[0]
+        store = self.synapses
+        active_indices = self.xp.flatnonzero(self.active_state)
 
-        # 활성화된 뉴런 쌍의 가중치 증가
-        for i in active_indices:
-            for j in active_indices:
-                if i != j:
-                    connected_indices = self.connections[i] == j
-                    self.weights[i, connected_indices] += 0.1  # 가중치 강화
+        # 활성 프리뉴런의 시냅스 중 포스트뉴런도 활성화된 연결 (자기 연결 제외)
+        positions, seg = store.row_positions(active_indices)
+        targets = store.targets[positions]
+        coactive = self.active_state[targets] & (targets != active_indices[seg])
+        coactive_positions, coactive_seg = positions[coactive], seg[coactive]
 
-        # 비활성화된 뉴런 연결 약화
-        inactive_indices = cp.where(~self.active_state)[0]
-        for i in inactive_indices:
-            self.weights[i] *= 0.99  # 가중치 감소
+        # 가중치 강화
+        strengthened = store.weight_values(coactive_positions, active_indices, coactive_seg) + learning_rate
+        store.scale_weights(decay)  # 나머지 연결 약화
+        store.set_weight_values(coactive_positions, active_indices, coactive_seg, strengthened)
+        self.metrics.count("synapses_updated", len(positions))
+        self.metrics.count("synapses_strengthened", len(coactive_positions))
+        self._changed_rows[active_indices] = True
 
-    def prune_and_rewire(self, threshold=0.2):
+    def prune_and_rewire(self, threshold=0.2, sprout=0, force=False):
         """
         약한 연결을 가지치고 새로운 연결을 형성.
+        rewire_interval번째 호출(또는 force)마다 전체 뉴런을 한 번에 처리하고,
+        rewire_changed_only이면 그 사이 호출에서는 가중치가 강화된 뉴런만 처리한다.
+        sprout > 0이면 활성 뉴런마다 다른 활성 뉴런으로 향하는 시냅스를 sprout개 새로 만든다.
+        """
+        self._rewire_counter += 1
+        if force or self._rewire_counter >= self.rewire_interval:
+            self._rewire_counter = 0
+            rows = self.xp.arange(self.num_neurons)
+        elif self.rewire_changed_only:
+            rows = self.xp.flatnonzero(self._changed_rows)
+        else:
+            return
+        self._changed_rows[:] = False
+        self._rewire_rows(rows, threshold, sprout)
+
+    def _rewire_rows(self, rows, threshold, sprout):
+        """
+        주어진 뉴런들의 시냅스를 한 번에 가지치기/재연결.
+        """
+        xp = self.xp
+        store = self.synapses
+
+        # 약한 연결 제거 (가중치 0으로 표시 후 압축)
+        store.prune_weak(rows, threshold)
+
+        # 함께 활성화된 뉴런 사이에 새 연결 형성
+        active_indices = xp.flatnonzero(self.active_state)
+        sprouting = active_indices[self._row_mask(rows)[active_indices]]
+        if sprout and len(active_indices) > 1 and len(sprouting) > 0:
+            counts = xp.full(len(sprouting), sprout, dtype=xp.int64)
+            self._grow_synapses(sprouting, counts, active_indices)
+
+        # 최대 연결 수를 넘는 뉴런은 가중치 상위 max_connections개만 유지
+        oversized = rows[store.row_lengths(rows) > self.max_connections]
+        if len(oversized) > 0:
+            store.keep_strongest(oversized, self.max_connections)
+
+        self.metrics.count("synapses_pruned", store.compact_rows(rows))
+
+        # 최소 연결 수보다 부족한 연결 보충
+        deficit = xp.maximum(self.min_connections - store.row_lengths(rows), 0)
+        self._grow_synapses(rows, deficit)
+
+        # 재배치로 버려진 구간과 남는 용량이 시냅스 수에 비해 커지면 회수
+        if store.needs_compaction():
+            store.compact(slack=GROWTH_SLACK, min_capacity=self.min_connections)
+
+    def _row_mask(self, rows):
+        """
+        rows에 포함된 뉴런을 표시한 마스크.
+        """
+        mask = self.xp.zeros(self.num_neurons, dtype=bool)
+        mask[rows] = True
+        return mask
+
+    def _grow_synapses(self, rows, counts, candidates=None):
+        """
+        뉴런 rows[k]에 counts[k]개의 새 시냅스를 추가.
+        타깃은 candidates에서 무작위로 선택하며, candidates가 없으면 전체 뉴런에서 바로 뽑는다.
+        """
+        grow = counts > 0
+        rows, counts = rows[grow], counts[grow]
+        if len(rows) == 0:
+            return
+        total = int(counts.sum())
+        self.metrics.count("synapses_added", total)
+        if candidates is None:
+            new_targets = self.rng.randint(0, self.num_neurons, total)
+        else:
+            new_targets = candidates[self.rng.randint(0, len(candidates), total)]
+        new_weights = self.rng.uniform(0.1, 1.0, total)
+        self.synapses.append(rows, counts, new_targets, new_weights)
+
+    def run_batch(self, stimuli, steps=1, learn=False):
+        """
+        여러 입력을 B개의 독립된 시퀀스로 한 번에 시뮬레이션.
+        stimuli는 (B, num_neurons) 배열, 길이 num_neurons 신호의 리스트,
+        또는 (인덱스, 값) 희소 자극의 리스트. 각 시퀀스는 현재 막전위에서 시작하며
+        네트워크의 막전위는 바뀌지 않는다. 모든 시퀀스를 (B * num_neurons) 공간에 펼쳐
+        스텝마다 행렬-행렬 전파 한 번으로 처리한다.
+        learn이면 각 시퀀스의 마지막 활성 상태로 update_weights를 적용.
+        시퀀스별 활성 뉴런 인덱스 리스트를 반환.
+        """
+        if steps < 1:
+            raise ValueError("steps must be at least 1.")
+        xp = self.xp
+        num_neurons = self.num_neurons
+        batch_size = len(stimuli)
+        potential = xp.tile(self.membrane_potential, (batch_size, 1))
+        self._add_batch_stimuli(potential, stimuli)
+
+        store = self.synapses
+        for _ in range(steps):
+            active = potential >= self.threshold
+            potential[active] = 0
+            batch_ids, rows = xp.nonzero(active)
+            positions, seg = store.row_positions(rows)
+            targets = store.targets[positions] + batch_ids[seg] * num_neurons
+            signal = store.weight_values(positions, rows, seg)
+            inputs = xp.bincount(targets, weights=signal, minlength=batch_size * num_neurons)
+            potential += inputs.reshape(batch_size, num_neurons)
+
+        # 시퀀스별 활성 뉴런 (호스트 동기화는 분할 위치를 구할 때 한 번)
+        ends = xp.cumsum(xp.bincount(batch_ids, minlength=batch_size)).tolist()
+        active_sets = xp.split(rows, ends[:-1])
+
+        if learn:
+            saved_state = self.active_state
+            for item in range(batch_size):
+                self.active_state = active[item]
+                self.update_weights()
+            self.active_state = saved_state
+        return active_sets
+
+    def _add_batch_stimuli(self, potential, stimuli):
+        """
+        (B, num_neurons) 막전위 배열에 입력 묶음을 더함.
+        희소 자극은 모두 이어붙여 한 번에 전송하고 scatter-add로 더한다.
         """
-        for i in range(self.num_neurons):
-            # 약한 연결 제거
-            weak_connections = cp.where(self.weights[i] < threshold)[0]
-            self.weights[i, weak_connections] = 0
-
-            # 동적 연결 조정 (1천 ~ 10만 범위 유지)
-            current_connections = len(self.connections[i])
-            if current_connections < self.min_connections:
-                # 부족한 연결 보충
-                new_targets = cp.random.randint(0, self.num_neurons, self.min_connections - current_connections)
-                new_weights = cp.random.uniform(0.1, 1.0, self.min_connections - current_connections)
-                self.connections[i] = cp.append(self.connections[i], new_targets)
-                self.weights[i] = cp.append(self.weights[i], new_weights)
-
-            elif current_connections > self.max_connections:
-                # 과도한 연결 제거
-                indices_to_keep = cp.argsort(self.weights[i])[-self.max_connections:]
-                self.connections[i] = self.connections[i][indices_to_keep]
-                self.weights[i] = self.weights[i][indices_to_keep]
+        xp = self.xp
+        if not isinstance(stimuli, (list, tuple)):
+            potential += xp.asarray(stimuli)
+            return
+        indices, values = [], []
+        for item, stimulus in enumerate(stimuli):
+            if isinstance(stimulus, tuple):
+                indices.append(np.asarray(stimulus[0], dtype=np.int64) + item * self.num_neurons)
+                values.append(np.asarray(stimulus[1]))
+            else:
+                potential[item] += xp.asarray(stimulus)
+        if indices:
+            flat = potential.reshape(-1)
+            scatter_add(xp, flat, xp.asarray(np.concatenate(indices)), xp.asarray(np.concatenate(values)))
 
     def get_active_neurons(self):
         """
         활성화된 뉴런의 인덱스를 반환.
         """
-        return cp.where(self.active_state)[0]
+        return self.xp.where(self.active_state)[0]
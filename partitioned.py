@@ -0,0 +1,533 @@
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from backend import asnumpy, seeded_random
+from neuron_model import check_dtypes, fire_neurons, generate_neurons
+from synapse_store import GROWTH_SLACK, SynapseStore
+
+# 작업자 명령
+STOP, UPDATE, UPDATE_WEIGHTS, REWIRE = range(4)
+
+
+def partition_ranges(num_neurons, num_parts):
+    """
+    뉴런 번호를 같은 크기의 연속 구간으로 나누는 할당 (분할 비용 없음).
+    """
+    return (np.arange(num_neurons) * num_parts // num_neurons).astype(np.int64)
+
+
+def _argsort_indices(values):
+    """
+    음이 아닌 정수 배열의 안정 정렬 순서. 16비트씩 두 번 기수 정렬(uint16의 안정 정렬)하므로
+    일반 비교 정렬보다 빠르다 (값이 2**32 미만일 때).
+    """
+    if len(values) == 0 or values.max() >= 1 << 32:
+        return np.argsort(values, kind="stable")
+    order = np.argsort((values & 0xFFFF).astype(np.uint16), kind="stable")
+    return order[np.argsort((values[order] >> 16).astype(np.uint16), kind="stable")]
+
+
+def partition_ldg(row_length, targets, num_parts, imbalance=0.05, batch_size=4096):
+    """
+    LDG(Linear Deterministic Greedy) 스트리밍 분할로 샤드 간 연결이 적도록 뉴런을 할당.
+    뉴런을 순서대로 보면서 이미 할당된 이웃(나가는/들어오는 연결)이 가장 많은 샤드를 고르되,
+    샤드가 찰수록 (1 - 크기 / 용량) 가중치로 점수를 낮춰 크기를 균형 있게 유지한다.
+    뉴런은 batch_size개씩 묶어 배열 연산으로 처리한다: 묶음 안의 뉴런은 이전 묶음까지의 할당만 보고
+    점수를 매기며, 남은 자리보다 많은 뉴런이 고른 샤드는 점수가 높은 뉴런부터 받고 나머지는 다음 후보로 보낸다.
+    """
+    num_neurons = len(row_length)
+    row_length = np.asarray(row_length, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    # 나가는 연결은 이미 행 순서로 모여 있으므로 들어오는 연결만 타깃 순으로 정렬해 두 CSR로 본다
+    out_starts = np.concatenate([[0], np.cumsum(row_length)])
+    in_degree = np.bincount(targets, minlength=num_neurons)
+    in_starts = np.concatenate([[0], np.cumsum(in_degree)])
+    in_sources = np.repeat(np.arange(num_neurons), row_length)[_argsort_indices(targets)]
+
+    capacity = np.ceil(num_neurons / num_parts * (1 + imbalance))
+    batch_size = max(1, min(batch_size, num_neurons // (16 * num_parts)))  # 묶음은 샤드 용량보다 충분히 작게
+    sizes = np.zeros(num_parts)
+    assignment = np.full(num_neurons, -1, dtype=np.int64)
+    parts = np.arange(num_parts)
+    for first in range(0, num_neurons, batch_size):
+        last = min(first + batch_size, num_neurons)
+        batch_rows = np.arange(last - first)
+        owners = np.concatenate([assignment[targets[out_starts[first]:out_starts[last]]],
+                                 assignment[in_sources[in_starts[first]:in_starts[last]]]])
+        rows = np.concatenate([np.repeat(batch_rows, row_length[first:last]),
+                               np.repeat(batch_rows, in_degree[first:last])])
+        known = owners >= 0
+        counts = np.bincount(rows[known] * num_parts + owners[known], minlength=(last - first) * num_parts)
+        # 동점이면 작은 샤드, 그래도 같으면 뉴런 번호에 따라 돌아가며 선택
+        spread = (parts[None, :] - np.arange(first, last)[:, None]) % num_parts
+        score = (counts.reshape(-1, num_parts) * (1 - sizes / capacity) - sizes / capacity * 1e-6
+                 - spread * 1e-9)
+        waiting = np.arange(last - first)
+        while len(waiting):
+            candidate = score[waiting]
+            candidate[:, sizes >= capacity] = -np.inf
+            choice = np.argmax(candidate, axis=1)
+            best = candidate[np.arange(len(waiting)), choice]
+            by_part = np.lexsort((-best, choice))
+            part_counts = np.bincount(choice, minlength=num_parts)
+            rank = np.empty(len(waiting), dtype=np.int64)
+            rank[by_part] = np.arange(len(waiting)) - (np.cumsum(part_counts) - part_counts)[choice[by_part]]
+            accepted = rank < (capacity - sizes)[choice]
+            assignment[first + waiting[accepted]] = choice[accepted]
+            sizes += np.bincount(choice[accepted], minlength=num_parts)
+            score[waiting[~accepted], choice[~accepted]] = -np.inf
+            waiting = waiting[~accepted]
+    return assignment
+
+
+def cut_fraction(row_length, targets, assignment):
+    """
+    샤드 경계를 넘는 시냅스의 비율.
+    """
+    sources = np.repeat(np.arange(len(row_length)), np.asarray(row_length, dtype=np.int64))
+    if len(sources) == 0:
+        return 0.0
+    return float((assignment[sources] != assignment[np.asarray(targets, dtype=np.int64)]).mean())
+
+
+def renumber(assignment, num_parts):
+    """
+    샤드마다 뉴런 번호가 연속 구간이 되도록 새 번호를 매김.
+    (새 번호 -> 원래 번호, 원래 번호 -> 새 번호, 샤드 경계 리스트)를 반환.
+    """
+    order = np.argsort(assignment, kind="stable")
+    inverse = np.empty_like(order)
+    inverse[order] = np.arange(len(order))
+    bounds = np.concatenate([[0], np.cumsum(np.bincount(assignment, minlength=num_parts))]).tolist()
+    return order, inverse, bounds
+
+
+def _buffer_layout(num_neurons, num_shards, capacity, dtype):
+    """
+    공유 메모리 버퍼의 이름 -> (모양, 형식).
+    - pending: 다음 틱에 더할 외부 자극, spikes: 마지막 틱의 발화 상태 (뉴런마다 하나)
+    - outbox_*: 샤드마다 다른 샤드로 보내는 (타깃, 입력) capacity개, offsets: 받는 샤드별 구간 경계,
+      remaining: 아직 보내지 못한 입력 수
+    교환 버퍼 전체는 샤드 수 * capacity이므로 capacity가 num_neurons / num_shards 정도면 O(뉴런 수)다.
+    """
+    return {
+        "pending": ((num_neurons,), dtype),
+        "spikes": ((num_neurons,), np.bool_),
+        "outbox_targets": ((num_shards, capacity), np.int64),
+        "outbox_values": ((num_shards, capacity), dtype),
+        "offsets": ((num_shards, num_shards + 1), np.int64),
+        "remaining": ((num_shards,), np.int64),
+    }
+
+
+def _attach(name, shape, dtype):
+    memory = shared_memory.SharedMemory(name=name)
+    return memory, np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+
+
+class Shard:
+    """
+    분할된 네트워크에서 한 작업자가 맡는 뉴런 구간 [start, stop)과 그 뉴런들의 나가는 시냅스.
+    시냅스 타깃은 (새 번호 기준) 전체 뉴런 공간을 가리키며, 발화는 공유 spikes 배열로 모두에게 보인다.
+    """
+
+    def __init__(self, index, start, stop, threshold, membrane_potential, synapses, min_connections,
+                 max_connections, seed, dense_activity=0.3):
+        self.index = index
+        self.start = start
+        self.stop = stop
+        self.threshold = threshold
+        self.membrane_potential = membrane_potential
+        self.synapses = synapses
+        self.min_connections = min_connections
+        self.max_connections = max_connections
+        self.dense_activity = dense_activity
+        self.rng = seeded_random(np, seed, 1, index)
+        synapses.rng = self.rng
+
+    def fire(self, pending, spikes):
+        """
+        대기 중인 외부 자극을 더한 뒤 발화하고, 발화 상태를 공유 spikes에 기록.
+        자기 구간으로 가는 입력은 바로 막전위에 더하고, 다른 샤드로 보낼 입력을 (타깃 오름차순, 값)으로 반환.
+        """
+        local = slice(self.start, self.stop)
+        self.membrane_potential += pending[local]
+        pending[local] = 0
+        active = fire_neurons(np, self.membrane_potential, self.threshold)
+        spikes[local] = active
+        targets, values = self.currents(np.flatnonzero(active), active)
+        inside = (targets >= self.start) & (targets < self.stop)
+        self.membrane_potential[targets[inside] - self.start] += values[inside]
+        return targets[~inside], values[~inside]
+
+    def currents(self, active_indices, active):
+        """
+        발화한 행들의 시냅스 입력을 타깃별로 합산한 (타깃 오름차순, 값).
+        활성 시냅스가 타깃 공간에 비해 적으면 타깃만 정렬해 합산하므로 전체 길이의 배열을 만들지 않는다.
+        """
+        store = self.synapses
+        if len(active_indices) >= self.dense_activity * len(active):
+            dense = store.propagate_dense(active)
+        else:
+            positions, seg = store.row_positions(active_indices)
+            if len(positions) < store.num_targets // 8:
+                targets, inverse = np.unique(store.targets[positions], return_inverse=True)
+                values = np.bincount(inverse.reshape(-1), weights=store.weight_values(positions, active_indices, seg))
+                return targets.astype(np.int64), values
+            dense = store.propagate(active_indices)
+        targets = np.flatnonzero(dense)
+        return targets, dense[targets]
+
+    def update_weights(self, spikes, learning_rate, decay):
+        """
+        NeuronNetwork.update_weights와 같은 Hebbian 규칙 (포스트뉴런 활성은 전체 spikes에서 읽음).
+        """
+        store = self.synapses
+        active_indices = np.flatnonzero(spikes[self.start:self.stop])
+        positions, seg = store.row_positions(active_indices)
+        targets = store.targets[positions]
+        coactive = spikes[targets] & (targets != active_indices[seg] + self.start)
+        coactive_positions, coactive_seg = positions[coactive], seg[coactive]
+        strengthened = store.weight_values(coactive_positions, active_indices, coactive_seg) + learning_rate
+        store.scale_weights(decay)
+        store.set_weight_values(coactive_positions, active_indices, coactive_seg, strengthened)
+
+    def prune_and_rewire(self, threshold):
+        """
+        NeuronNetwork의 전체 가지치기/재연결과 같은 처리 (새 타깃은 전체 뉴런 공간에서 선택).
+        """
+        store = self.synapses
+        rows = np.arange(self.stop - self.start)
+        store.prune_weak(rows, threshold)
+        oversized = rows[store.row_lengths(rows) > self.max_connections]
+        if len(oversized) > 0:
+            store.keep_strongest(oversized, self.max_connections)
+        store.compact_rows(rows)
+
+        deficit = np.maximum(self.min_connections - store.row_lengths(rows), 0)
+        grow = deficit > 0
+        if grow.any():
+            total = int(deficit[grow].sum())
+            new_targets = self.rng.randint(0, store.num_targets, total)
+            new_weights = self.rng.uniform(0.1, 1.0, total)
+            store.append(rows[grow], deficit[grow], new_targets, new_weights)
+        if store.needs_compaction():
+            store.compact(slack=GROWTH_SLACK, min_capacity=self.min_connections)
+
+
+def _build_shard(state):
+    """
+    작업자 안에서 Shard를 구성. state에 'generate'가 있으면 자기 구간의 뉴런을 직접 생성하고
+    (부모 프로세스는 네트워크를 들고 있지 않음), 없으면 전달받은 배열로 구성한다.
+    """
+    generate = state.pop("generate", None)
+    if generate is not None:
+        threshold, synapses = generate_neurons(np, start=state["start"], stop=state["stop"], **generate)
+        membrane_potential = np.zeros(len(threshold), dtype=threshold.dtype)
+        return Shard(threshold=threshold, membrane_potential=membrane_potential, synapses=synapses, **state)
+    row_length, targets, weights, row_scale, num_neurons = state.pop("synapses")
+    synapses = SynapseStore.from_csr(row_length, targets, weights, len(row_length), np, row_scale,
+                                     num_targets=num_neurons)
+    return Shard(synapses=synapses, **state)
+
+
+def _exchange(shard, targets, values, buffers, bounds, barrier):
+    """
+    다른 샤드로 보낼 입력(타깃 오름차순)을 outbox에 쓰고, 다른 샤드가 이 샤드로 보낸 입력을 막전위에 더함.
+    한 번에 outbox 용량만큼씩 보내며, 어느 샤드라도 남은 입력이 있으면 모든 샤드가 한 번 더 교환한다.
+    """
+    outbox_targets, outbox_values = buffers["outbox_targets"], buffers["outbox_values"]
+    offsets, remaining = buffers["offsets"], buffers["remaining"]
+    index = shard.index
+    capacity = outbox_targets.shape[1]
+    sent = 0
+    while True:
+        chunk_targets, chunk_values = targets[sent:sent + capacity], values[sent:sent + capacity]
+        count = len(chunk_targets)
+        outbox_targets[index, :count] = chunk_targets
+        outbox_values[index, :count] = chunk_values
+        offsets[index] = np.searchsorted(chunk_targets, bounds)  # 받는 샤드별 구간 경계
+        sent += count
+        remaining[index] = len(targets) - sent
+        barrier.wait()
+        for source in range(len(offsets)):
+            low, high = offsets[source, index], offsets[source, index + 1]
+            if high > low:
+                received = outbox_targets[source, low:high] - shard.start
+                shard.membrane_potential[received] += outbox_values[source, low:high]
+        more = bool(remaining.any())  # 모든 샤드가 다음 장벽 전에 같은 값을 읽음
+        barrier.wait()
+        if not more:
+            return
+
+
+def _shard_worker(state, bounds, names, layout, control, params, start_barrier, exchange_barrier, done_barrier):
+    """
+    작업자 프로세스: 샤드를 구성한 뒤 명령을 기다렸다가 자기 샤드에 대해 실행.
+    UPDATE는 발화 -> 다른 샤드로 보낼 입력 교환(작업자끼리 동기화) 순서로 진행된다.
+    """
+    memories = []
+    buffers = {}
+    try:
+        shard = _build_shard(state)
+        for name, (shape, dtype) in layout.items():
+            memory, buffers[name] = _attach(names[name], shape, dtype)
+            memories.append(memory)
+        done_barrier.wait()  # 구성 완료
+        while True:
+            start_barrier.wait()
+            command = control.value
+            if command == STOP:
+                break
+            if command == UPDATE:
+                targets, values = shard.fire(buffers["pending"], buffers["spikes"])
+                _exchange(shard, targets, values, buffers, bounds, exchange_barrier)
+            elif command == UPDATE_WEIGHTS:
+                shard.update_weights(buffers["spikes"], params[0], params[1])
+            elif command == REWIRE:
+                shard.prune_and_rewire(params[0])
+            done_barrier.wait()
+    except Exception:
+        # 다른 프로세스가 장벽에서 영원히 기다리지 않도록 장벽을 깨뜨림
+        for barrier in (start_barrier, exchange_barrier, done_barrier):
+            barrier.abort()
+        raise
+    finally:
+        buffers.clear()
+        for memory in memories:
+            try:
+                memory.close()
+            except BufferError:
+                pass  # 예외 추적 정보가 아직 배열 뷰를 참조하는 경우 (프로세스 종료 시 해제)
+
+
+class PartitionedNetwork:
+    """
+    뉴런 번호 공간을 여러 작업자 프로세스로 나눈 NeuronNetwork.
+    각 작업자는 자기 뉴런의 상태와 나가는 시냅스를 소유한다. 생성자는 작업자마다 자기 구간의 뉴런을
+    NeuronNetwork와 같은 시드 규칙으로 직접 생성하므로 (같은 seed면 같은 네트워크) 한 프로세스에
+    다 들어가지 않는 크기도 만들 수 있다. 무작위로 연결된 초기 네트워크는 어떻게 나눠도 경계를 넘는
+    연결 비율이 같으므로 연속 구간으로 나눈다. 학습된 네트워크는 from_network로 샤드 간 연결이 적게 다시 나눈다.
+    틱마다 발화 상태는 공유 spikes 배열로, 다른 샤드로 가는 입력은 타깃별로 합산한 희소 (타깃, 값)으로만
+    교환하므로 교환량은 발화한 뉴런의 경계를 넘는 시냅스 수에 비례한다 (Barrier로 동기화).
+    외부 API(stimulate_neurons, get_active_neurons)는 원래 뉴런 번호를 사용한다.
+    MemoryManager처럼 시냅스 저장소에 직접 접근하는 기능은 지원하지 않는다.
+    """
+
+    def __init__(self, num_neurons, min_connections=1000, max_connections=100000, num_shards=None, seed=None,
+                 block_size=65536, index_dtype="int64", weight_dtype="float64", state_dtype="float64",
+                 dense_activity=0.3, exchange_capacity=None, context=None):
+        check_dtypes(num_neurons, index_dtype, weight_dtype)
+        num_shards = min(num_shards or multiprocessing.cpu_count(), num_neurons)
+        self._setup(num_neurons, num_shards, min_connections, max_connections,
+                    seed if seed is not None else np.random.SeedSequence().entropy)
+        self.bounds = (np.arange(num_shards + 1) * num_neurons // num_shards).tolist()
+        self.order = self.inverse = None  # 원래 번호를 그대로 사용
+        self.cut_fraction = None
+        generate = {
+            "seed": self.seed,
+            "num_neurons": num_neurons,
+            "min_connections": min_connections,
+            "block_size": block_size,
+            "index_dtype": index_dtype,
+            "weight_dtype": weight_dtype,
+            "state_dtype": state_dtype,
+        }
+        states = [
+            {**self._common_state(index, dense_activity), "generate": generate} for index in range(num_shards)
+        ]
+        self._launch(states, np.dtype(state_dtype), exchange_capacity, context)
+
+    @classmethod
+    def from_network(cls, network, num_shards=None, partitioner="ldg", exchange_capacity=None, context=None):
+        """
+        이미 있는 (학습되었거나 스냅샷에서 불러온) NeuronNetwork를 샤드 간 연결이 적도록 나눔.
+        분할기는 샤드 간 연결이 적도록 뉴런을 할당한 뒤 샤드마다 연속 구간이 되게 번호를 다시 매긴다.
+        샤드로 옮긴 뒤에는 network를 버려도 된다.
+        """
+        if partitioner not in ("ldg", "range"):
+            raise ValueError(f"Unknown partitioner: {partitioner!r} (expected 'ldg' or 'range').")
+        self = cls.__new__(cls)
+        num_shards = min(num_shards or multiprocessing.cpu_count(), network.num_neurons)
+        self._setup(network.num_neurons, num_shards, network.min_connections, network.max_connections,
+                    network.seed or 0)
+
+        store = network.synapses
+        positions, _ = store.row_positions()
+        row_length = asnumpy(store.row_lengths())
+        targets = asnumpy(store.targets[positions])
+        if partitioner == "ldg":
+            assignment = partition_ldg(row_length, targets, num_shards)
+        else:
+            assignment = partition_ranges(self.num_neurons, num_shards)
+        self.cut_fraction = cut_fraction(row_length, targets, assignment)  # 샤드 경계를 넘는 시냅스 비율
+        self.order, self.inverse, self.bounds = renumber(assignment, num_shards)
+        del positions, targets
+
+        states = []
+        for index in range(num_shards):
+            states.append({**self._common_state(index, network.dense_activity), **self._shard_arrays(network, index)})
+        dtype = np.dtype(asnumpy(network.membrane_potential[:0]).dtype)
+        self._launch(states, dtype, exchange_capacity, context)
+        return self
+
+    def _setup(self, num_neurons, num_shards, min_connections, max_connections, seed):
+        self.xp = np
+        self.num_neurons = num_neurons
+        self.num_shards = num_shards
+        self.min_connections = min_connections
+        self.max_connections = max_connections
+        self.seed = seed
+        self._memories = {}
+        self.workers = []
+
+    def _common_state(self, index, dense_activity):
+        return {
+            "index": index,
+            "start": self.bounds[index],
+            "stop": self.bounds[index + 1],
+            "min_connections": self.min_connections,
+            "max_connections": self.max_connections,
+            "seed": self.seed,
+            "dense_activity": dense_activity,
+        }
+
+    def _shard_arrays(self, network, index):
+        """
+        샤드 index가 맡을 뉴런들의 상태와 시냅스를 새 번호로 옮겨 담은 배열 (작업자에서 Shard를 구성).
+        """
+        start, stop = self.bounds[index], self.bounds[index + 1]
+        rows = self.order[start:stop]
+        store = network.synapses
+        device_rows = network.xp.asarray(rows)
+        positions, _ = store.row_positions(device_rows)
+        targets = self.inverse[asnumpy(store.targets[positions])].astype(store.targets.dtype)
+        row_scale = None if store.row_scale is None else asnumpy(store.row_scale[device_rows])
+        synapses = (asnumpy(store.row_lengths(device_rows)), targets, asnumpy(store.weights[positions]), row_scale,
+                    self.num_neurons)
+        return {
+            "threshold": asnumpy(network.threshold[device_rows]),
+            "membrane_potential": asnumpy(network.membrane_potential[device_rows]),
+            "synapses": synapses,
+        }
+
+    def _launch(self, states, dtype, exchange_capacity, context):
+        """
+        공유 버퍼를 만들고 샤드마다 작업자를 시작한 뒤 모두 구성될 때까지 기다림.
+        """
+        if exchange_capacity is None:
+            exchange_capacity = max(1 << 16, -(-self.num_neurons // self.num_shards))
+        layout = _buffer_layout(self.num_neurons, self.num_shards, exchange_capacity, dtype)
+        buffers = {name: self._create(name, shape, array_dtype) for name, (shape, array_dtype) in layout.items()}
+        self.pending, self.spikes = buffers["pending"], buffers["spikes"]
+        names = {name: memory.name for name, memory in self._memories.items()}
+
+        context = context or multiprocessing.get_context()
+        self.control = context.Value("i", UPDATE, lock=False)
+        self.params = context.Array("d", 2, lock=False)
+        self._start = context.Barrier(self.num_shards + 1)
+        self._exchange = context.Barrier(self.num_shards)
+        self._done = context.Barrier(self.num_shards + 1)
+        for state in states:
+            worker = context.Process(
+                target=_shard_worker,
+                args=(state, self.bounds, names, layout, self.control, self.params, self._start, self._exchange,
+                      self._done),
+                daemon=True,
+            )
+            worker.start()
+            self.workers.append(worker)
+        try:
+            self._done.wait()  # 작업자가 샤드를 구성하다 실패하면 장벽이 깨져 여기서 예외 발생
+        except Exception:
+            self.close()
+            raise
+
+    def _create(self, name, shape, dtype):
+        size = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+        memory = shared_memory.SharedMemory(create=True, size=size)
+        self._memories[name] = memory
+        array = np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+        array[...] = 0
+        return array
+
+    def _run(self, command, *params):
+        """
+        모든 작업자에게 명령을 보내고 끝날 때까지 기다림.
+        """
+        self.control.value = command
+        for i, value in enumerate(params):
+            self.params[i] = value
+        self._start.wait()
+        if command != STOP:
+            self._done.wait()
+
+    def stimulate_neurons(self, input_signals):
+        """
+        뉴런을 외부 신호로 자극 (다음 update_neurons에서 각 샤드가 반영).
+        input_signals는 길이 num_neurons의 신호 배열 또는 (인덱스, 값) 희소 자극 (원래 뉴런 번호).
+        """
+        if isinstance(input_signals, tuple):
+            indices, values = input_signals
+            indices = asnumpy(indices)
+            if self.inverse is not None:
+                indices = self.inverse[indices]
+            np.add.at(self.pending, indices, asnumpy(values))
+        else:
+            signals = asnumpy(input_signals)
+            self.pending += signals if self.order is None else signals[self.order]
+
+    def update_neurons(self):
+        """
+        모든 샤드에서 한 틱을 실행: 발화, 입력 교환, 막전위 갱신.
+        """
+        self._run(UPDATE)
+
+    def update_weights(self, learning_rate=0.1, decay=0.99):
+        """
+        Hebbian Learning을 기반으로 연결 강도를 업데이트 (샤드별 병렬).
+        """
+        self._run(UPDATE_WEIGHTS, learning_rate, decay)
+
+    def prune_and_rewire(self, threshold=0.2):
+        """
+        약한 연결을 가지치고 최소 연결 수까지 새 연결을 형성 (샤드별 병렬).
+        """
+        self._run(REWIRE, threshold)
+
+    def get_active_neurons(self):
+        """
+        활성화된 뉴런의 (원래) 인덱스를 반환.
+        """
+        active = np.flatnonzero(self.spikes)
+        if self.order is None:
+            return active
+        return np.sort(self.order[active])
+
+    def close(self):
+        """
+        작업자를 종료하고 공유 메모리를 해제.
+        """
+        if self.workers:
+            try:
+                self._run(STOP)
+            except Exception:
+                pass
+            for worker in self.workers:
+                worker.join(timeout=5)
+                if worker.is_alive():
+                    worker.terminate()
+            self.workers = []
+        self.pending = self.spikes = None  # 공유 메모리를 닫기 전에 배열 뷰 해제
+        for memory in self._memories.values():
+            memory.close()
+            memory.unlink()
+        self._memories = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,137 @@
+import queue
+import threading
+
+import numpy as np
+
+
+def coalesce(stimuli):
+    """
+    한 틱 동안 쌓인 자극(뉴런 입력 신호 배열)들을 더해 하나로 합침.
+    """
+    if len(stimuli) == 1:
+        return stimuli[0]
+    return np.sum(stimuli, axis=0)
+
+
+def on_request(requests, capture):
+    """
+    requests 큐에 요청(인자 튜플)이 들어올 때마다 capture(*인자)의 결과를 내보내는 제너레이터.
+    None을 받으면 끝난다.
+    """
+    for args in iter(requests.get, None):
+        yield capture(*args)
+
+
+class SensoryIngestion:
+    """
+    감각 입력 수집을 시뮬레이션 루프와 분리하는 클래스.
+    감각(모달리티)마다 작업 스레드가 자극을 만들어 크기가 제한된 큐에 넣고,
+    시뮬레이션 쪽은 ticks()로 틱마다 쌓인 자극을 한꺼번에 꺼내 하나로 합친다.
+    큐가 가득 차면 overflow='block'인 소스는 기다리고 (네트워크가 밀릴 때의 역압),
+    overflow='drop'인 소스(실시간 카메라 등)는 가장 오래된 자극을 버린다.
+    """
+
+    def __init__(self, maxsize=8):
+        self.maxsize = maxsize
+        self.sources = {}  # 이름 -> (자극 이터러블, overflow)
+        self.queues = {}  # 이름 -> 대기 중인 자극 큐
+        self.threads = []
+        self.errors = []  # 작업 스레드에서 발생한 (이름, 예외)
+        self._running = 0
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+
+    def add_source(self, name, stimuli, maxsize=None, overflow="block"):
+        """
+        자극을 차례로 내보내는 이터러블(제너레이터 등)을 감각 소스로 등록.
+        """
+        if overflow not in ("block", "drop"):
+            raise ValueError(f"Unknown overflow policy: {overflow!r} (expected 'block' or 'drop').")
+        self.sources[name] = (stimuli, overflow)
+        self.queues[name] = queue.Queue(maxsize or self.maxsize)
+
+    def start(self):
+        """
+        소스마다 작업 스레드를 시작.
+        """
+        self._stop.clear()
+        for name, (stimuli, overflow) in self.sources.items():
+            thread = threading.Thread(target=self._worker, args=(name, stimuli, overflow), daemon=True)
+            with self._lock:
+                self._running += 1
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self):
+        """
+        작업 스레드에 중지를 알림 (입력 대기 중인 스레드는 데몬이므로 프로그램 종료를 막지 않는다).
+        """
+        self._stop.set()
+        self._ready.set()
+
+    def _worker(self, name, stimuli, overflow):
+        try:
+            for stimulus in stimuli:
+                if self._stop.is_set():
+                    break
+                self._put(self.queues[name], stimulus, overflow)
+        except Exception as error:
+            self.errors.append((name, error))
+        finally:
+            with self._lock:
+                self._running -= 1
+            self._ready.set()
+
+    def _put(self, pending, stimulus, overflow):
+        if overflow == "drop":
+            while True:
+                try:
+                    pending.put_nowait(stimulus)
+                    break
+                except queue.Full:
+                    try:
+                        pending.get_nowait()  # 가장 오래된 자극을 버림
+                    except queue.Empty:
+                        pass
+        else:
+            while not self._stop.is_set():
+                try:
+                    pending.put(stimulus, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+        self._ready.set()
+
+    def poll(self):
+        """
+        대기 중인 자극을 모두 꺼내 (소스 이름, 자극) 리스트로 반환.
+        작업 스레드에서 예외가 났으면 여기서 다시 발생시킨다.
+        """
+        self._ready.clear()
+        items = []
+        for name, pending in self.queues.items():
+            while True:
+                try:
+                    items.append((name, pending.get_nowait()))
+                except queue.Empty:
+                    break
+        if self.errors:
+            name, error = self.errors.pop(0)
+            raise RuntimeError(f"Sensory source {name!r} failed.") from error
+        return items
+
+    def ticks(self, timeout=0.1):
+        """
+        틱마다 (자극을 보낸 소스 이름 리스트, 합친 자극)을 반환하는 제너레이터.
+        자극이 없으면 들어올 때까지 기다리고, 모든 소스가 끝나 큐가 비면 종료한다.
+        """
+        while not self._stop.is_set():
+            running = self._running
+            items = self.poll()
+            if items:
+                yield [name for name, _ in items], coalesce([stimulus for _, stimulus in items])
+            elif running == 0:
+                return
+            else:
+                self._ready.wait(timeout)
@@ -1,19 +1,32 @@
+import os
+
 from neuron_model import NeuronNetwork
 from memory import MemoryManager
 from retina_processor import RetinaProcessor
 from cochlea_processor import CochleaProcessor
 from text_processor import TextProcessor
 from dialogue_manager import DialogueManager
-import cupy as cp
+
+
+def print_progress(done, total):
+    """
+    네트워크 초기화 진행 상황 출력.
+    """
+    print(f"\rInitializing network: {done / total:6.1%}", end="\n" if done == total else "", flush=True)
 
 
 def main():
     num_neurons = 15000000  # 전체 뉴런 수
     min_connections = 1000  # 최소 시냅스 연결 수
     max_connections = 100000  # 최대 시냅스 연결 수
+    backend = None  # 배열 백엔드 (None이면 NEURALCLOUD_BACKEND 환경 변수, 기본 numpy)
+    seed = None  # 난수 시드 (같은 seed면 항상 같은 네트워크)
 
     # 뉴런 네트워크 및 처리기 초기화
-    network = NeuronNetwork(num_neurons, min_connections, max_connections)
+    network = NeuronNetwork(
+        num_neurons, min_connections, max_connections, backend=backend,
+        seed=seed, workers=os.cpu_count() or 1, progress=print_progress,
+    )
     memory_manager = MemoryManager(network)
     dialogue_manager = DialogueManager(memory_manager)
     retina_processor = RetinaProcessor(network)
@@ -42,7 +55,7 @@ def main():
             continue
 
         print("Stimulating neurons...")
-        network.stimulate_neurons(cp.asarray(input_signals))
+        network.stimulate_neurons(input_signals)
 
         print("Updating neurons and synapses...")
         network.update_neurons()
@@ -1,6 +1,3 @@
-import numpy as np
-
-
 class MemoryManager:
     """
     뉴런 네트워크의 기억 저장 및 검색 기능을 관리.
@@ -38,10 +35,16 @@ class MemoryManager:
         """
         장기 기억을 통합하고 관련성을 강화.
         """
+        synapses = self.network.synapses
+        xp = self.network.xp
+        in_pattern = xp.zeros(self.network.num_neurons, dtype=bool)
         for pattern in self.long_term_memory.keys():
-            indices = np.array(pattern)
-            for i in indices:
-                for j in indices:
-                    if i != j:
-                        connected_indices = self.network.synapses[i] == j
-                        self.network.synapses[i].weight += 0.05
+            in_pattern[:] = False
+            in_pattern[xp.asarray(pattern, dtype=xp.int64)] = True
+            # 패턴 안의 서로 다른 두 뉴런을 잇는 시냅스를 한 번에 강화
+            connected = (
+                in_pattern[synapses.pre_neuron]
+                & in_pattern[synapses.post_neuron]
+                & (synapses.pre_neuron != synapses.post_neuron)
+            )
+            synapses.weight[connected] += 0.05
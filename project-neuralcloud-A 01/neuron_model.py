@@ -1,5 +1,136 @@
-import cupy as cp
-from synapse import Synapse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from backend import get_array_module
+from synapse import SynapsePool
+
+SEED_CHUNK = 4096  # 난수 시드를 나누는 뉴런 단위
+
+
+def _neuron_rng(seed, chunk):
+    """
+    청크의 뉴런 파라미터(빈도, 강도, 연결 수)용 난수 생성기.
+    """
+    return np.random.default_rng([seed, chunk, 0])
+
+
+def _draw_neuron_params(rng, count, min_connections, max_connections):
+    """
+    청크 안 뉴런들의 활동전위 빈도, 강도, 시냅스 연결 수를 생성.
+    """
+    frequency = rng.uniform(1.0, 20.0, count)
+    strength = rng.uniform(1.0, 5.0, count)
+    num_connections = rng.integers(min_connections, max_connections, count)
+    return frequency, strength, num_connections
+
+
+def count_synapses(seed, num_neurons, min_connections, max_connections):
+    """
+    뉴런별 시냅스 연결 수를 미리 계산 (풀 배열을 한 번에 할당하기 위함).
+
+    Returns:
+        numpy array: 뉴런별 연결 수.
+    """
+    counts = []
+    for chunk_start in range(0, num_neurons, SEED_CHUNK):
+        count = min(SEED_CHUNK, num_neurons - chunk_start)
+        rng = _neuron_rng(seed, chunk_start // SEED_CHUNK)
+        counts.append(_draw_neuron_params(rng, count, min_connections, max_connections)[2])
+    return np.concatenate(counts)
+
+
+def generate_synapse_block(seed, start, stop, num_neurons, min_connections, max_connections):
+    """
+    뉴런 [start, stop) 구간의 뉴런 파라미터와 시냅스를 호스트(numpy)에서 생성.
+    SEED_CHUNK마다 (seed, 청크 번호)로 난수 생성기를 만들므로
+    블록 크기나 작업자 수와 관계없이 같은 결과가 나온다.
+
+    Args:
+        seed (int): 난수 시드.
+        start (int): 시작 뉴런 (SEED_CHUNK의 배수).
+        stop (int): 끝 뉴런 (미포함).
+        num_neurons (int): 총 뉴런 수.
+        min_connections (int): 최소 시냅스 연결 수.
+        max_connections (int): 최대 시냅스 연결 수.
+
+    Returns:
+        tuple: (start, stop, 빈도, 강도, 프리뉴런, 포스트뉴런, 가중치, 소포 수, 칼슘 농도).
+    """
+    parts = [[] for _ in range(7)]
+    for chunk_start in range(start, stop, SEED_CHUNK):
+        chunk = chunk_start // SEED_CHUNK
+        count = min(SEED_CHUNK, stop - chunk_start)
+        frequency, strength, num_connections = _draw_neuron_params(
+            _neuron_rng(seed, chunk), count, min_connections, max_connections
+        )
+        total = int(num_connections.sum())
+        rng = np.random.default_rng([seed, chunk, 1])  # 시냅스 파라미터용
+        values = (
+            frequency,
+            strength,
+            np.repeat(np.arange(chunk_start, chunk_start + count), num_connections),
+            rng.integers(0, num_neurons, total),
+            rng.uniform(0.1, 1.0, total),
+            rng.uniform(5, 100, total),
+            rng.uniform(0.1, 1.0, total),
+        )
+        for part, value in zip(parts, values):
+            part.append(value)
+    return (start, stop) + tuple(np.concatenate(part) for part in parts)
+
+
+def generation_window(block_size, workers=1):
+    """
+    초기화 중 한꺼번에 메모리에 있을 수 있는 블록의 (블록당 뉴런 수, 블록 수).
+    작업자가 여러 개면 블록을 작업자 수만큼 잘게 나누고 대기 블록 수도 제한하므로,
+    생성 중인 블록 전체는 작업자 수와 관계없이 block_size의 약 2배 이내다.
+
+    Args:
+        block_size (int): 블록당 뉴런 수.
+        workers (int): 작업자 프로세스 수.
+
+    Returns:
+        tuple: (블록당 뉴런 수 (SEED_CHUNK의 배수), 대기 블록 수).
+    """
+    step = -(-block_size // max(workers, 1))
+    step = -(-step // SEED_CHUNK) * SEED_CHUNK  # SEED_CHUNK의 배수로 올림
+    if workers <= 1:
+        return step, 1
+    return step, max(2, min(workers + 1, 2 * block_size // step))
+
+
+def iter_synapse_blocks(seed, num_neurons, min_connections, max_connections, block_size, workers=1):
+    """
+    뉴런 블록을 순서대로 생성하는 제너레이터.
+    블록 크기와 대기 블록 수는 generation_window로 정하므로 생성 중인 시냅스는
+    작업자 수와 관계없이 block_size개 뉴런의 약 2배 분량(뉴런당 최대 max_connections개) 이내다.
+
+    Args:
+        block_size (int): 한 번에 메모리에 둘 뉴런 수의 기준.
+        workers (int): 작업자 프로세스 수. 1보다 크면 병렬 생성한다.
+
+    Yields:
+        tuple: generate_synapse_block의 반환값.
+    """
+    block_size, window = generation_window(block_size, workers)
+    args = [
+        (seed, start, min(start + block_size, num_neurons), num_neurons, min_connections, max_connections)
+        for start in range(0, num_neurons, block_size)
+    ]
+    if workers <= 1:
+        for arg in args:
+            yield generate_synapse_block(*arg)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = []
+        for arg in args:
+            pending.append(executor.submit(generate_synapse_block, *arg))
+            if len(pending) >= window:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
 
 
 class NeuronNetwork:
@@ -7,7 +138,8 @@ class NeuronNetwork:
     연합뉴런 네트워크를 구현한 클래스. 뉴런 간 신호 전달 및 학습을 처리.
     """
 
-    def __init__(self, num_neurons, min_connections=1000, max_connections=100000):
+    def __init__(self, num_neurons, min_connections=1000, max_connections=100000, backend=None,
+                 seed=None, block_size=65536, workers=1, progress=None):
         """
         연합뉴런 네트워크 초기화.
 
@@ -15,19 +147,32 @@ class NeuronNetwork:
             num_neurons (int): 총 뉴런 수.
             min_connections (int): 각 뉴런의 최소 시냅스 연결 수.
             max_connections (int): 각 뉴런의 최대 시냅스 연결 수.
+            backend (str, optional): 배열 백엔드 ('numpy' 또는 'cupy').
+                None이면 NEURALCLOUD_BACKEND 환경 변수를 따른다.
+            seed (int, optional): 난수 시드. 같은 (seed, num_neurons, 연결 수 범위)는
+                항상 같은 네트워크를 만든다.
+            block_size (int): 초기화할 때 한 번에 생성하는 뉴런 수.
+            workers (int): 시냅스 생성에 사용할 작업자 프로세스 수.
+            progress (callable, optional): progress(완료 뉴런 수, 총 뉴런 수) 진행 상황 콜백.
         """
+        self.xp = get_array_module(backend)  # CuPy는 요청될 때만 로드
+        xp = self.xp
         self.num_neurons = num_neurons
         self.min_connections = min_connections
         self.max_connections = max_connections
+        self.seed = seed if seed is not None else np.random.SeedSequence().entropy
+        self.block_size = block_size
+        self.workers = workers
+        self.progress = progress
 
         # 뉴런 상태 초기화
-        self.threshold = cp.random.uniform(-50, -50, size=num_neurons)  # 최소 역치값 -50
-        self.membrane_potential = cp.full(num_neurons, -70.0)  # 초기 막전위 -70
-        self.active_state = cp.zeros(num_neurons, dtype=bool)  # 활성화 상태
-        self.action_potential_frequency = cp.random.uniform(1.0, 20.0, size=num_neurons)  # 활동전위 빈도
-        self.action_potential_strength = cp.random.uniform(1.0, 5.0, size=num_neurons)  # 활동전위 강도
+        self.threshold = xp.random.uniform(-50, -50, size=num_neurons)  # 최소 역치값 -50
+        self.membrane_potential = xp.full(num_neurons, -70.0)  # 초기 막전위 -70
+        self.active_state = xp.zeros(num_neurons, dtype=bool)  # 활성화 상태
+        self.action_potential_frequency = xp.empty(num_neurons)  # 활동전위 빈도
+        self.action_potential_strength = xp.empty(num_neurons)  # 활동전위 강도
 
-        # 시냅스 초기화
+        # 시냅스 초기화 (뉴런 파라미터도 함께 채움)
         self.synapses = self.initialize_synapses()
 
     def initialize_synapses(self):
@@ -35,29 +180,38 @@ class NeuronNetwork:
         시냅스 초기화: 뉴런 간 연결 생성.
 
         Returns:
-            list: 초기화된 시냅스 리스트.
+            SynapsePool: 모든 시냅스를 담은 구조체 배열 풀.
         """
-        synapses = []
-        for pre_neuron in range(self.num_neurons):
-            num_connections = cp.random.randint(self.min_connections, self.max_connections)
-            post_neurons = cp.random.randint(0, self.num_neurons, size=num_connections)
-            weights = cp.random.uniform(0.1, 1.0, size=num_connections)
-            vesicle_counts = cp.random.uniform(5, 100, size=num_connections)
-            calcium_levels = cp.random.uniform(0.1, 1.0, size=num_connections)
-
-            synapses.extend(
-                [
-                    Synapse(
-                        pre_neuron,
-                        post_neurons[i],
-                        weights[i],
-                        vesicle_counts[i],
-                        calcium_levels[i],
-                    )
-                    for i in range(num_connections)
-                ]
-            )
-        return synapses
+        xp = self.xp
+        index_dtype = xp.int32 if self.num_neurons < 2**31 else xp.int64
+        counts = count_synapses(self.seed, self.num_neurons, self.min_connections, self.max_connections)
+        num_synapses = int(counts.sum())
+        del counts
+
+        # 최종 배열을 한 번만 할당하고 블록 단위로 채워 최대 메모리 사용량을 제한
+        pre_neurons = xp.empty(num_synapses, dtype=index_dtype)
+        post_neurons = xp.empty(num_synapses, dtype=index_dtype)
+        weights = xp.empty(num_synapses, dtype=xp.float32)
+        vesicle_counts = xp.empty(num_synapses, dtype=xp.float32)
+        calcium_levels = xp.empty(num_synapses, dtype=xp.float32)
+
+        offset = 0
+        blocks = iter_synapse_blocks(
+            self.seed, self.num_neurons, self.min_connections, self.max_connections, self.block_size, self.workers
+        )
+        for start, stop, frequency, strength, pre, post, weight, vesicle, calcium in blocks:
+            self.action_potential_frequency[start:stop] = xp.asarray(frequency)
+            self.action_potential_strength[start:stop] = xp.asarray(strength)
+            end = offset + len(pre)
+            pre_neurons[offset:end] = xp.asarray(pre)
+            post_neurons[offset:end] = xp.asarray(post)
+            weights[offset:end] = xp.asarray(weight)
+            vesicle_counts[offset:end] = xp.asarray(vesicle)
+            calcium_levels[offset:end] = xp.asarray(calcium)
+            offset = end
+            if self.progress is not None:
+                self.progress(stop, self.num_neurons)
+        return SynapsePool(pre_neurons, post_neurons, weights, vesicle_counts, calcium_levels, xp)
 
     def stimulate_neurons(self, input_signals):
         """
@@ -66,7 +220,7 @@ class NeuronNetwork:
         Args:
             input_signals (array-like): 외부 입력 신호.
         """
-        self.membrane_potential += input_signals
+        self.membrane_potential += self.xp.asarray(input_signals)
 
     def update_neurons(self):
         """
@@ -75,20 +229,24 @@ class NeuronNetwork:
         self.active_state = self.membrane_potential >= self.threshold
         self.membrane_potential[self.active_state] = -70  # 활성화 후 막전위 초기화
 
-        for synapse in self.synapses:
-            pre_active = self.active_state[synapse.pre_neuron]
-            frequency = self.action_potential_frequency[synapse.pre_neuron]
-            strength = self.action_potential_strength[synapse.pre_neuron]
-            synapse.release_neurotransmitter(pre_active, frequency * strength)
+        # 전체 시냅스 풀에 대해 한 번에 신경전달물질 방출 및 신호 전달
+        synapses = self.synapses
+        pre = synapses.pre_neuron
+        pre_active = self.active_state[pre]
+        frequency = self.action_potential_frequency[pre]
+        strength = self.action_potential_strength[pre]
+        synapses.release_neurotransmitter(pre_active, frequency * strength)
 
-            signal = synapse.transmit_signal()
-            self.membrane_potential[synapse.post_neuron] += signal
+        signal = synapses.transmit_signal()
+        self.membrane_potential += self.xp.bincount(
+            synapses.post_neuron, weights=signal, minlength=self.num_neurons
+        )
 
     def update_weights(self):
         """
         Hebbian Learning 기반으로 시냅스 가중치 업데이트.
         """
-        for synapse in self.synapses:
-            pre_active = self.active_state[synapse.pre_neuron]
-            post_active = self.active_state[synapse.post_neuron]
-            synapse.update_weight(pre_active, post_active)
+        synapses = self.synapses
+        pre_active = self.active_state[synapses.pre_neuron]
+        post_active = self.active_state[synapses.post_neuron]
+        synapses.update_weight(pre_active, post_active)
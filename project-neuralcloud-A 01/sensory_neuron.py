@@ -1,3 +1,6 @@
+import queue
+
+from ingestion import SensoryIngestion, coalesce, on_request
 from retina_processor import RetinaProcessor
 from cochlea_processor import CochleaProcessor
 from text_processor import TextProcessor
@@ -20,6 +23,8 @@ class SensoryNeuron:
         self.visual_processor = RetinaProcessor(neuron_network)  # 시각
         self.audio_processor = CochleaProcessor(neuron_network)  # 청각
         self.text_processor = TextProcessor(neuron_network)  # 텍스트
+        self.ingestion = None  # 비동기 수집 (start_ingestion에서 생성)
+        self.requests = {}
 
     def process_visual_input(self):
         """
@@ -50,3 +55,63 @@ class SensoryNeuron:
         print("Processing text input...")
         signals = self.text_processor.process_text(text)
         self.neuron_network.stimulate_neurons(signals)
+
+    def start_ingestion(self, maxsize=8):
+        """
+        감각별 작업 스레드를 시작하여 캡처와 부호화를 네트워크 갱신과 겹쳐 실행.
+        이후 request_* 메서드로 입력을 요청하고 process_pending_input으로 네트워크에 전달한다.
+
+        Args:
+            maxsize (int): 감각별 대기 자극 큐의 최대 크기 (가득 차면 캡처가 기다림).
+        """
+        self.requests = {name: queue.Queue() for name in ("visual", "audio", "text")}
+        self.ingestion = SensoryIngestion(maxsize)
+        self.ingestion.add_source("visual", on_request(self.requests["visual"], self.visual_processor.capture_webcam))
+        self.ingestion.add_source("audio", on_request(self.requests["audio"], self.audio_processor.capture_microphone))
+        self.ingestion.add_source("text", on_request(self.requests["text"], self.text_processor.process_text))
+        self.ingestion.start()
+
+    def request_visual_input(self):
+        """
+        카메라 입력을 비동기로 요청.
+        """
+        self.requests["visual"].put(())
+
+    def request_audio_input(self, duration=3):
+        """
+        마이크 입력을 비동기로 요청.
+
+        Args:
+            duration (int): 마이크로 캡처할 오디오 길이 (초 단위).
+        """
+        self.requests["audio"].put((duration,))
+
+    def request_text_input(self, text):
+        """
+        텍스트 입력을 비동기로 요청.
+
+        Args:
+            text (str): 사용자 입력 텍스트.
+        """
+        self.requests["text"].put((text,))
+
+    def process_pending_input(self):
+        """
+        지금까지 준비된 감각 입력을 모두 합쳐 뉴런 네트워크로 한 번에 전달.
+
+        Returns:
+            list: 입력을 보낸 감각 이름 리스트 (준비된 입력이 없으면 빈 리스트).
+        """
+        items = self.ingestion.poll()
+        if items:
+            signals = coalesce([stimulus for _, stimulus in items])
+            self.neuron_network.stimulate_neurons(signals)
+        return [name for name, _ in items]
+
+    def stop_ingestion(self):
+        """
+        감각별 작업 스레드를 종료.
+        """
+        for pending in self.requests.values():
+            pending.put(None)
+        self.ingestion.stop()
@@ -1,46 +1,170 @@
-class Synapse:
+class SynapsePool:
     """
-    현실의 시냅스 작동 방식을 모방한 클래스.
+    모든 시냅스를 구조체 배열(struct-of-arrays) 형태로 저장하는 클래스.
+    시냅스마다 Python 객체를 만드는 대신 프리/포스트뉴런 인덱스와 생물학적 파라미터를
+    같은 길이의 배열로 보관하고, 시냅스 동작을 전체 풀에 대한 벡터 연산으로 처리한다.
     """
 
-    def __init__(self, pre_neuron, post_neuron, weight, vesicle_count, calcium_concentration):
+    FIELDS = (
+        "pre_neuron",
+        "post_neuron",
+        "weight",
+        "vesicle_count",
+        "calcium_concentration",
+        "receptor_sensitivity",
+        "feedback",
+        "neurotransmitter_level",
+    )
+
+    def __init__(self, pre_neuron, post_neuron, weight, vesicle_count, calcium_concentration, xp,
+                 dtype="float32"):
         """
-        시냅스 초기화.
+        시냅스 풀 초기화.
 
         Args:
-            pre_neuron (int): 프리뉴런 ID.
-            post_neuron (int): 포스트뉴런 ID.
-            weight (float): 시냅스 가중치.
-            vesicle_count (float): 시냅스 소포 수.
-            calcium_concentration (float): 칼슘 이온 농도.
+            pre_neuron (array): 프리뉴런 ID 배열.
+            post_neuron (array): 포스트뉴런 ID 배열.
+            weight (array): 시냅스 가중치 배열.
+            vesicle_count (array): 시냅스 소포 수 배열.
+            calcium_concentration (array): 칼슘 이온 농도 배열.
+            xp (module): 배열 백엔드 (numpy 또는 cupy).
+            dtype (str): 파라미터 배열의 부동소수점 형식.
         """
-        self.pre_neuron = pre_neuron
-        self.post_neuron = post_neuron
-        self.weight = weight
-        self.neurotransmitter_level = 0.0  # 신경전달물질 농도
+        self.xp = xp
+        num_synapses = len(weight)
+        self.pre_neuron = xp.asarray(pre_neuron)
+        self.post_neuron = xp.asarray(post_neuron)
+        self.weight = xp.asarray(weight, dtype=dtype)
 
         # 생물학적 파라미터
-        self.vesicle_count = vesicle_count  # 시냅스 소포의 수
-        self.calcium_concentration = calcium_concentration  # 칼슘 이온 농도
-        self.receptor_sensitivity = 1.0  # 수용체 민감도
-        self.feedback = 0.0  # 후시냅스에서 전달되는 피드백
+        self.vesicle_count = xp.asarray(vesicle_count, dtype=dtype)  # 시냅스 소포의 수
+        self.calcium_concentration = xp.asarray(calcium_concentration, dtype=dtype)  # 칼슘 이온 농도
+        self.receptor_sensitivity = xp.ones(num_synapses, dtype=dtype)  # 수용체 민감도
+        self.feedback = xp.zeros(num_synapses, dtype=dtype)  # 후시냅스에서 전달되는 피드백
+        self.neurotransmitter_level = xp.zeros(num_synapses, dtype=dtype)  # 신경전달물질 농도
 
-    def release_neurotransmitter(self, action_potential_frequency, action_potential_strength):
+    def __len__(self):
+        return len(self.weight)
+
+    def __getitem__(self, index):
+        """
+        단일 시냅스를 살펴보기 위한 뷰를 반환.
+
+        Args:
+            index (int): 시냅스 번호.
+
+        Returns:
+            Synapse: 풀의 index번째 시냅스 뷰.
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Synapse index out of range.")
+        return Synapse(self, index)
+
+    def release_neurotransmitter(self, action_potential_frequency, action_potential_strength, index=slice(None)):
         """
         활동전위 강도와 빈도를 기반으로 신경전달물질 방출량 계산.
 
         Args:
-            action_potential_frequency (float): 활동전위 빈도.
-            action_potential_strength (float): 활동전위 강도.
+            action_potential_frequency (array): 시냅스별 활동전위 빈도.
+            action_potential_strength (array): 시냅스별 활동전위 강도.
+            index (slice or array, optional): 처리할 시냅스 (기본값: 전체).
         """
-        calcium_effect = self.calcium_concentration * self.vesicle_count
+        calcium_effect = self.calcium_concentration[index] * self.vesicle_count[index]
         release_amount = (
-            self.weight
+            self.weight[index]
             * action_potential_frequency
             * action_potential_strength
             * calcium_effect
         )
-        self.neurotransmitter_level += release_amount
+        self.neurotransmitter_level[index] += release_amount
+
+    def transmit_signal(self, index=slice(None)):
+        """
+        신경전달물질을 기반으로 신호 전달.
+
+        Args:
+            index (slice or array, optional): 처리할 시냅스 (기본값: 전체).
+
+        Returns:
+            array: 시냅스별로 포스트뉴런에 전달되는 신호 크기.
+        """
+        signal = self.neurotransmitter_level[index] * self.receptor_sensitivity[index]
+        self.neurotransmitter_level[index] *= 0.95  # 신경전달물질의 자연 감소
+        return signal
+
+    def update_feedback(self, feedback_value, index=slice(None)):
+        """
+        후시냅스 뉴런에서 전달된 피드백에 따라 민감도 조정.
+
+        Args:
+            feedback_value (array): 시냅스별 피드백 값.
+            index (slice or array, optional): 처리할 시냅스 (기본값: 전체).
+        """
+        self.feedback[index] = feedback_value
+        sensitivity = self.receptor_sensitivity[index] + 0.01 * self.xp.asarray(feedback_value)
+        self.receptor_sensitivity[index] = self.xp.clip(sensitivity, 0.1, 2.0)  # 민감도 제한
+
+    def update_weight(self, pre_neuron_active, post_neuron_active, learning_rate=0.01, index=slice(None)):
+        """
+        Hebbian Learning 기반으로 시냅스 가중치 업데이트.
+
+        Args:
+            pre_neuron_active (array): 시냅스별 프리뉴런 활성 상태.
+            post_neuron_active (array): 시냅스별 포스트뉴런 활성 상태.
+            learning_rate (float): 학습률.
+            index (slice or array, optional): 처리할 시냅스 (기본값: 전체).
+        """
+        weight = self.weight[index]
+        coactive = self.xp.logical_and(pre_neuron_active, post_neuron_active)
+        # 활성화된 연결 강화, 비활성화된 연결 약화
+        self.weight[index] = self.xp.where(coactive, weight + learning_rate, weight * 0.99)
+
+
+class Synapse:
+    """
+    SynapsePool 안의 시냅스 하나를 다루는 뷰 클래스.
+    기존 시냅스 객체와 같은 속성과 메서드를 제공하며, 값은 풀 배열에서 직접 읽고 쓴다.
+    """
+
+    def __init__(self, pool, index):
+        """
+        시냅스 뷰 초기화.
+
+        Args:
+            pool (SynapsePool): 시냅스가 속한 풀.
+            index (int): 풀 안의 시냅스 번호.
+        """
+        self.pool = pool
+        self.index = index
+
+    def __getattr__(self, name):
+        if name in SynapsePool.FIELDS:
+            return getattr(self.pool, name)[self.index].item()
+        raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        if name in SynapsePool.FIELDS:
+            getattr(self.pool, name)[self.index] = value
+        else:
+            super().__setattr__(name, value)
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in SynapsePool.FIELDS)
+        return f"Synapse({values})"
+
+    def release_neurotransmitter(self, action_potential_frequency, action_potential_strength):
+        """
+        활동전위 강도와 빈도를 기반으로 신경전달물질 방출량 계산.
+
+        Args:
+            action_potential_frequency (float): 활동전위 빈도.
+            action_potential_strength (float): 활동전위 강도.
+        """
+        self.pool.release_neurotransmitter(
+            action_potential_frequency, action_potential_strength, index=self.index
+        )
 
     def transmit_signal(self):
         """
@@ -49,9 +173,7 @@ class Synapse:
         Returns:
             float: 포스트뉴런으로 전달되는 신호 크기.
         """
-        signal = self.neurotransmitter_level * self.receptor_sensitivity
-        self.neurotransmitter_level *= 0.95  # 신경전달물질의 자연 감소
-        return signal
+        return self.pool.transmit_signal(index=self.index).item()
 
     def update_feedback(self, feedback_value):
         """
@@ -60,9 +182,7 @@ class Synapse:
         Args:
             feedback_value (float): 피드백 값.
         """
-        self.feedback = feedback_value
-        self.receptor_sensitivity += 0.01 * feedback_value
-        self.receptor_sensitivity = max(0.1, min(2.0, self.receptor_sensitivity))  # 민감도 제한
+        self.pool.update_feedback(feedback_value, index=self.index)
 
     def update_weight(self, pre_neuron_active, post_neuron_active, learning_rate=0.01):
         """
@@ -73,7 +193,4 @@ class Synapse:
             post_neuron_active (bool): 포스트뉴런의 활성 상태.
             learning_rate (float): 학습률.
         """
-        if pre_neuron_active and post_neuron_active:
-            self.weight += learning_rate  # 활성화된 연결 강화
-        else:
-            self.weight *= 0.99  # 비활성화된 연결 약화
+        self.pool.update_weight(pre_neuron_active, post_neuron_active, learning_rate, index=self.index)
@@ -0,0 +1,111 @@
+import os
+
+from metrics import NULL_METRICS
+
+TEXT_EXTENSIONS = (".txt",)
+AUDIO_EXTENSIONS = (".wav",)
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv")
+KINDS = ("text", "audio", "image", "video")
+
+
+def input_kind(path):
+    """
+    파일 확장자로 입력 종류를 판별 (알 수 없으면 None).
+    """
+    extension = os.path.splitext(path)[1].lower()
+    for kind, extensions in zip(KINDS, (TEXT_EXTENSIONS, AUDIO_EXTENSIONS, IMAGE_EXTENSIONS, VIDEO_EXTENSIONS)):
+        if extension in extensions:
+            return kind
+    return None
+
+
+def read_text_lines(path):
+    """
+    텍스트 파일의 비어 있지 않은 줄 (줄마다 입력 하나).
+    """
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def read_script(path):
+    """
+    세션 스크립트를 (종류, 인자) 리스트로 읽음.
+    한 줄에 명령 하나: 'text 문장', 'audio 경로', 'image 경로', 'video 경로'.
+    빈 줄과 '#' 주석은 무시하고, 상대 경로는 스크립트가 있는 디렉터리를 기준으로 한다.
+    """
+    base = os.path.dirname(os.path.abspath(path))
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            kind, _, argument = line.partition(" ")
+            kind, argument = kind.lower(), argument.strip()
+            if kind not in KINDS or not argument:
+                raise ValueError(f"{path}:{number}: expected '<text|audio|image|video> <argument>', got {line!r}.")
+            if kind != "text":
+                argument = os.path.join(base, argument)
+            entries.append((kind, argument))
+    return entries
+
+
+def scan_directory(path):
+    """
+    디렉터리의 녹화 입력을 이름 순으로 (종류, 인자) 리스트로 변환 (하위 디렉터리 포함).
+    텍스트 파일은 줄마다 입력 하나, 나머지 파일은 파일마다 입력 하나이며 알 수 없는 파일은 건너뛴다.
+    """
+    entries = []
+    for root, directories, files in os.walk(path):
+        directories.sort()
+        for name in sorted(files):
+            file_path = os.path.join(root, name)
+            kind = input_kind(file_path)
+            if kind == "text":
+                entries += [("text", line) for line in read_text_lines(file_path)]
+            elif kind is not None:
+                entries.append((kind, file_path))
+    return entries
+
+
+def replay_entries(path):
+    """
+    디렉터리면 scan_directory, 파일이면 세션 스크립트로 읽음.
+    """
+    if os.path.isdir(path):
+        return scan_directory(path)
+    return read_script(path)
+
+
+def replay_stimuli(entries, text_processor, cochlea_processor, retina_processor, metrics=NULL_METRICS):
+    """
+    (종류, 인자)를 차례로 (종류, 이름, 자극)으로 변환하는 제너레이터.
+    동영상은 프레임마다 자극 하나를 내보내며 이름은 '경로#프레임번호'.
+    부호화 시간은 'encode_<종류>' span으로 기록한다.
+    """
+    for kind, argument in entries:
+        if kind == "video":
+            retina_processor.open(argument)
+            try:
+                frame_index = 0
+                while True:
+                    with metrics.span("encode_video"):
+                        frame = retina_processor.read_frame()
+                        stimulus = None if frame is None else retina_processor.process_image(frame)
+                    if stimulus is None:
+                        break
+                    yield kind, f"{argument}#{frame_index}", stimulus
+                    frame_index += 1
+            finally:
+                retina_processor.close()
+            continue
+
+        with metrics.span(f"encode_{kind}"):
+            if kind == "text":
+                stimulus = text_processor.process_text(argument)
+            elif kind == "audio":
+                stimulus = cochlea_processor.process_wav(argument)
+            else:
+                stimulus = retina_processor.process_image_file(argument)
+        yield kind, argument, stimulus
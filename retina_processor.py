@@ -1,30 +1,127 @@
-import cv2
 import numpy as np
 
+from stimulus import region_stimulus, sensory_region
+
 
 class RetinaProcessor:
-    def __init__(self, neuron_network):
+    """
+    이미지를 시각 자극으로 변환하는 클래스 (망막 모방).
+    프레임을 grid 크기(가로, 세로) x pool 로 줄인 뒤 중심-주변(DoG) 필터로 ON/OFF 세포 반응을 구하고,
+    pool x pool 수용장마다 최대값을 모아 2 * 가로 * 세로 개의 신호를 만든다 (ON 세포 다음 OFF 세포).
+    changed_only이면 직전 프레임과의 반응 차이가 diff_threshold를 넘는 수용장만 내보낸다.
+    OpenCV(cv2)는 이미지를 처리할 때 import 하므로 텍스트/오디오만 다룰 때는 설치하지 않아도 된다.
+    """
+
+    def __init__(self, neuron_network, region_start=None, region_size=None, grid=(64, 48), pool=2,
+                 center_sigma=1.0, surround_sigma=3.0, changed_only=False, diff_threshold=0.1, source=0):
         self.network = neuron_network
+        # 시각 신호를 받을 뉴런 영역 (기본값은 sensory_region의 시각 영역)
+        self.region_start, self.region_size = sensory_region(
+            "vision", neuron_network.num_neurons, region_start, region_size
+        )
+        self.grid = grid
+        self.pool = pool
+        self.center_sigma = center_sigma
+        self.surround_sigma = surround_sigma
+        self.changed_only = changed_only
+        self.diff_threshold = diff_threshold
+        self.source = source  # 카메라 번호 또는 동영상 파일 경로
+        self.capture = None  # 계속 열어 두는 cv2.VideoCapture
+        self._previous = None  # 프레임 차분용 직전 반응
+
+    def receptive_fields(self, frame):
+        """
+        프레임의 수용장별 ON/OFF 반응 (길이 2 * 가로 * 세로, [0, 1]).
+        """
+        import cv2
+
+        width, height = self.grid
+        if frame.ndim == 3:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        image = cv2.resize(frame, (width * self.pool, height * self.pool), interpolation=cv2.INTER_AREA)
+        image = image.astype(np.float32) / np.float32(255.0)  # [0, 1]로 정규화
+        center = cv2.GaussianBlur(image, (0, 0), self.center_sigma)
+        surround = cv2.GaussianBlur(image, (0, 0), self.surround_sigma)
+        dog = center - surround
+        cells = np.stack([np.maximum(dog, 0), np.maximum(-dog, 0)])  # ON, OFF 세포
+        pooled = cells.reshape(2, height, self.pool, width, self.pool).max(axis=(2, 4)).ravel()
+        peak = pooled.max()
+        if peak > 0:
+            pooled /= peak
+        return pooled
 
     def process_image(self, frame):
         """
-        이미지를 뉴런 신호로 변환 (망막 모방).
+        이미지를 뉴런 신호(희소 자극)로 변환 (망막 모방).
         """
-        gray_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        flattened = gray_frame.flatten() / 255.0  # [0, 1]로 정규화
-        signals = np.pad(flattened, (0, self.network.num_neurons - len(flattened)), 'constant')
-        return signals
+        response = self.receptive_fields(frame)
+        if self.changed_only:
+            previous, self._previous = self._previous, response
+            if previous is not None:
+                response = np.where(np.abs(response - previous) > self.diff_threshold, response, 0)
+        return region_stimulus(response, self.network.num_neurons, self.region_start, self.region_size)
 
-    def capture_webcam(self):
+    def process_image_file(self, path):
         """
-        웹캠에서 이미지를 캡처하고 망막 처리.
+        이미지 파일을 읽어 자극으로 변환 (카메라 없이 녹화 입력 일괄 처리).
         """
-        cap = cv2.VideoCapture(0)
-        if not cap.isOpened():
-            raise RuntimeError("Could not open webcam.")
-        ret, frame = cap.read()
-        cap.release()
+        import cv2
+
+        frame = cv2.imread(path)
+        if frame is None:
+            raise RuntimeError(f"Could not read image {path!r}.")
+        return self.process_image(frame)
+
+    def open(self, source=None):
+        """
+        카메라나 동영상 파일을 열어 둠 (이미 열려 있으면 그대로 사용).
+        """
+        if source is not None and source != self.source:
+            self.close()
+            self.source = source
+        if self.capture is None:
+            import cv2
+
+            capture = cv2.VideoCapture(self.source)
+            if not capture.isOpened():
+                raise RuntimeError(f"Could not open video source {self.source!r}.")
+            self.capture = capture
+        return self.capture
 
-        if not ret:
+    def close(self):
+        """
+        열어 둔 카메라나 동영상 파일을 닫음.
+        """
+        if self.capture is not None:
+            self.capture.release()
+            self.capture = None
+        self._previous = None
+
+    def read_frame(self):
+        """
+        열어 둔 입력에서 프레임 하나를 읽음 (끝나면 None).
+        """
+        ret, frame = self.open().read()
+        return frame if ret else None
+
+    def stream(self, source=None, max_frames=None):
+        """
+        카메라나 동영상 파일의 프레임을 차례로 자극으로 변환하는 제너레이터.
+        """
+        self.open(source)
+        count = 0
+        while max_frames is None or count < max_frames:
+            frame = self.read_frame()
+            if frame is None:
+                return
+            yield self.process_image(frame)
+            count += 1
+
+    def capture_webcam(self):
+        """
+        웹캠에서 이미지를 캡처하고 망막 처리 (카메라는 열어 둔 채로 재사용).
+        """
+        frame = self.read_frame()
+        if frame is None:
             raise RuntimeError("Failed to capture image from webcam.")
         return self.process_image(frame)
@@ -0,0 +1,133 @@
+import os
+
+import numpy as np
+
+from backend import BACKEND_ENV_VAR, get_array_module, backend_name
+from neuron_model import generation_window
+from synapse_store import COPY_BLOCK, GROWTH_SLACK, RESERVE_GROWTH, WASTE_FRACTION
+
+POSITION_DTYPE = np.dtype(np.int64)  # row_positions가 만드는 위치/구간 번호 배열
+GENERATED_ITEMSIZE = 8  # generate_neuron_block이 만드는 역치/타깃/가중치 (float64/int64)
+
+
+def estimate_footprint(num_neurons, min_connections, max_connections, index_dtype="int64",
+                       weight_dtype="float64", state_dtype="float64", growth=0.5, activity=1.0, dense_cache=True,
+                       block_size=65536, workers=1):
+    """
+    NeuronNetwork 하나가 차지할 바이트 수를 항목별로 추정 (SynapseStore의 성장/압축 규칙 기준).
+    - neurons: 역치, 막전위(state_dtype), 활성/변경 상태(bool), CSR 행 시작/길이/용량(int64),
+      uint8 양자화 가중치면 행별 scale(float32)
+    - synapses: 풀의 타깃/가중치와 dense 전파 캐시(슬롯마다 int32). 시냅스 수는 prune_and_rewire로 행이
+      growth만큼 늘어난 값(max_connections 이하)이고, 풀은 압축되기 직전까지 그보다 WASTE_FRACTION만큼 클 수 있다
+    - working: 갱신 중 임시 배열 (활성 비율 activity의 시냅스에 대한 위치, 구간 번호, 타깃, 가중치, 마스크)
+    - rebuild: 풀이 바뀌는 순간 잠깐 함께 존재하는 배열. 풀 배열 확장(이전 배열 + RESERVE_GROWTH배 새 배열)과
+      압축/재구성(확장된 이전 풀 + GROWTH_SLACK의 여유를 둔 새 풀 + COPY_BLOCK 크기의 임시 배열) 중 큰 쪽
+    - init: 초기화 중 생성 작업자들이 함께 들고 있는 블록 (generation_window)
+    working, rebuild, init은 서로 다른 시점에 생기므로 total에는 가장 큰 것만 더한다.
+    """
+    index_size = np.dtype(index_dtype).itemsize
+    weight_size = np.dtype(weight_dtype).itemsize
+    quantized = np.dtype(weight_dtype) == np.uint8
+    per_neuron = 2 * np.dtype(state_dtype).itemsize + 2 + 3 * 8 + (4 if quantized else 0)
+    synapses = num_neurons * min(max_connections, int(np.ceil(min_connections * (1 + growth))))
+    slots = int(np.ceil(synapses * (1 + WASTE_FRACTION)))
+    per_pair = index_size + weight_size
+    per_slot = per_pair + (4 if dense_cache else 0)
+    per_working = 2 * POSITION_DTYPE.itemsize + per_pair + 1
+    grow_slots = RESERVE_GROWTH * slots
+    repack_slots = (RESERVE_GROWTH - 1) * slots + (1 + GROWTH_SLACK) * synapses
+    step, window = generation_window(block_size, workers)
+    footprint = {
+        "neurons": num_neurons * per_neuron,
+        "synapses": slots * per_slot,
+        "working": int(synapses * activity) * per_working,
+        "rebuild": int(max(grow_slots, repack_slots) * per_pair) + min(COPY_BLOCK, synapses) * per_working,
+        "init": min(num_neurons, step * window) * (1 + 2 * min_connections) * GENERATED_ITEMSIZE,
+    }
+    footprint["total"] = footprint["neurons"] + footprint["synapses"] + max(
+        footprint["working"], footprint["rebuild"], footprint["init"]
+    )
+    return footprint
+
+
+def available_memory(backend=None):
+    """
+    백엔드가 쓸 수 있는 메모리 바이트 수 (numpy: 사용 가능한 RAM, cupy: 남은 GPU 메모리).
+    """
+    xp = get_array_module(backend)
+    if xp is not np:
+        free, _ = xp.cuda.runtime.memGetInfo()
+        return int(free)
+    try:
+        with open("/proc/meminfo", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+
+
+def plan_network(min_connections, max_connections, max_neurons=None, budget_bytes=None, backend=None,
+                 fraction=0.8, granularity=1000, **options):
+    """
+    예산 안에 들어가는 가장 큰 뉴런 수를 선택 (아무것도 할당하지 않음).
+    budget_bytes가 없으면 사용 가능한 메모리의 fraction을 예산으로 삼고,
+    max_neurons를 주면 그보다 크게 잡지 않는다. options는 estimate_footprint로 전달.
+    예산 안에 뉴런 granularity개도 들어가지 않으면 MemoryError.
+    """
+    if backend is None:
+        backend = os.environ.get(BACKEND_ENV_VAR, "numpy")
+    available = available_memory(backend)
+    if budget_bytes is None:
+        budget_bytes = int(available * fraction)
+
+    # 추정치는 뉴런 수에 대해 증가하므로 granularity 단위로 예산에 맞는 최대 크기를 탐색
+    def fits(units):
+        total = estimate_footprint(units * granularity, min_connections, max_connections, **options)["total"]
+        return total <= budget_bytes
+
+    limit = None if max_neurons is None else -(-max_neurons // granularity)
+    low, high = 0, 1
+    while (limit is None or high <= limit) and fits(high):
+        low, high = high, 2 * high
+    if limit is not None:
+        high = min(high, limit + 1)
+    while high - low > 1:
+        middle = (low + high) // 2
+        if fits(middle):
+            low = middle
+        else:
+            high = middle
+    num_neurons = low * granularity
+    if max_neurons is not None:
+        num_neurons = min(num_neurons, max_neurons)
+    if num_neurons < granularity and (max_neurons is None or num_neurons < max_neurons):
+        raise MemoryError(
+            f"A network with {min_connections} connections per neuron does not fit in {budget_bytes} bytes."
+        )
+    return {
+        "backend": backend_name(get_array_module(backend)),
+        "num_neurons": num_neurons,
+        "min_connections": min_connections,
+        "max_connections": max_connections,
+        "available_bytes": available,
+        "budget_bytes": budget_bytes,
+        "footprint": estimate_footprint(num_neurons, min_connections, max_connections, **options),
+    }
+
+
+def format_plan(plan):
+    """
+    계획을 사람이 읽을 수 있는 여러 줄 문자열로 변환.
+    """
+    gib = 1024 ** 3
+    footprint = plan["footprint"]
+    lines = [
+        f"Network plan ({plan['backend']}): {plan['num_neurons']:,} neurons, "
+        f"{plan['min_connections']}-{plan['max_connections']} connections per neuron",
+        f"  available {plan['available_bytes'] / gib:.2f} GiB, budget {plan['budget_bytes'] / gib:.2f} GiB",
+    ]
+    for name in ("neurons", "synapses", "working", "rebuild", "init", "total"):
+        lines.append(f"  {name:<9}{footprint[name] / gib:8.2f} GiB")
+    return "\n".join(lines)
@@ -0,0 +1,199 @@
+import json
+import os
+import shutil
+
+import numpy as np
+
+from backend import asnumpy, get_array_module
+from neuron_model import NeuronNetwork
+from synapse_store import SynapseStore
+
+SNAPSHOT_FORMAT = "neuralcloud-snapshot"
+SNAPSHOT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+
+class SnapshotWriter:
+    """
+    스냅샷 디렉터리에 1차원 원시 배열 파일(.bin)을 기록.
+    배열은 조각 단위로 이어 쓸 수 있고, 매니페스트는 close()에서 마지막에 저장되므로
+    중간에 중단된 스냅샷은 불러올 수 없는 상태로 남는다.
+    """
+
+    def __init__(self, path):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.arrays = {}
+
+    def write(self, name, array):
+        """
+        배열 하나를 통째로 기록.
+        """
+        self.arrays.pop(name, None)
+        self.append(name, array)
+
+    def append(self, name, chunk):
+        """
+        배열 파일 끝에 조각을 이어 씀 (처음 쓰는 이름이면 새 파일 생성).
+        """
+        chunk = np.ascontiguousarray(asnumpy(chunk)).reshape(-1)
+        entry = self.arrays.get(name)
+        if entry is None:
+            entry = {"file": f"{name}.bin", "dtype": chunk.dtype.str, "length": 0}
+            self.arrays[name] = entry
+            mode = "wb"
+        else:
+            chunk = chunk.astype(entry["dtype"], copy=False)
+            mode = "ab"
+        with open(os.path.join(self.path, entry["file"]), mode) as f:
+            chunk.tofile(f)
+        entry["length"] += len(chunk)
+
+    def close(self, **metadata):
+        """
+        매니페스트를 원자적으로 저장하여 스냅샷을 완성.
+        """
+        manifest = {"format": SNAPSHOT_FORMAT, "version": SNAPSHOT_VERSION, **metadata, "arrays": self.arrays}
+        temp_path = os.path.join(self.path, MANIFEST_NAME + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, os.path.join(self.path, MANIFEST_NAME))
+
+
+def read_manifest(path):
+    """
+    스냅샷 매니페스트를 읽고 형식/버전을 확인.
+    """
+    with open(os.path.join(path, MANIFEST_NAME), encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError(f"{path} is not a network snapshot.")
+    if manifest.get("version", 0) > SNAPSHOT_VERSION:
+        raise ValueError(f"Snapshot version {manifest['version']} is newer than supported ({SNAPSHOT_VERSION}).")
+    return manifest
+
+
+def open_array(path, manifest, name, mode="c"):
+    """
+    스냅샷 배열을 numpy.memmap으로 열기 (실제 데이터는 접근할 때 페이지 단위로 읽힘).
+    mode='c'이면 메모리에서 수정해도 파일은 바뀌지 않는다.
+    """
+    entry = manifest["arrays"][name]
+    if entry["length"] == 0:
+        return np.zeros(0, dtype=entry["dtype"])
+    array = np.memmap(os.path.join(path, entry["file"]), dtype=entry["dtype"], mode=mode, shape=(entry["length"],))
+    return array.view(np.ndarray)
+
+
+def _to_backend(xp, array, block_size):
+    """
+    호스트 배열을 백엔드 배열로 변환. GPU로 보낼 때는 블록 단위로 복사해 호스트 메모리 사용을 제한.
+    """
+    if xp is np:
+        return array
+    result = xp.empty(len(array), dtype=array.dtype)
+    for start in range(0, len(array), block_size):
+        result[start:start + block_size] = xp.asarray(array[start:start + block_size])
+    return result
+
+
+def save_snapshot(path, network, memory_manager=None, block_size=65536):
+    """
+    네트워크 상태(와 장기 기억)를 스냅샷 디렉터리에 저장.
+    시냅스는 block_size개 뉴런씩 모아 압축된 CSR로 이어 쓰므로 한 번에 블록 하나만 호스트로 복사된다.
+    새 스냅샷은 임시 디렉터리에 쓴 뒤 교체하므로, 같은 경로에서 memmap으로 불러온 네트워크도 저장할 수 있다.
+    """
+    path = os.path.normpath(path)
+    partial_path = path + ".partial"
+    shutil.rmtree(partial_path, ignore_errors=True)
+    writer = SnapshotWriter(partial_path)
+    writer.write("threshold", network.threshold)
+    writer.write("membrane_potential", network.membrane_potential)
+    writer.write("active_state", network.active_state)
+
+    xp = network.xp
+    store = network.synapses
+    writer.write("row_length", store.row_lengths())
+    if store.row_scale is not None:
+        writer.write("row_scale", store.row_scale)  # 양자화된 가중치의 행별 scale
+    writer.write("targets", store.targets[:0])
+    writer.write("weights", store.weights[:0])
+    for start in range(0, network.num_neurons, block_size):
+        rows = xp.arange(start, min(start + block_size, network.num_neurons))
+        positions, _ = store.row_positions(rows)
+        writer.append("targets", store.targets[positions])
+        writer.append("weights", store.weights[positions])
+
+    memory = None
+    if memory_manager is not None:
+        store = memory_manager.long_term_memory
+        texts = []
+        writer.write("memory_lengths", np.zeros(0, dtype=np.int64))
+        writer.write("memory_patterns", np.zeros(0, dtype=np.uint32))
+        for pattern_id in sorted(store.ids()):
+            pattern, text = store.get(pattern_id)
+            writer.append("memory_lengths", np.array([len(pattern)], dtype=np.int64))
+            writer.append("memory_patterns", pattern)
+            texts.append(text)
+        memory = {"texts": texts}
+
+    writer.close(
+        num_neurons=network.num_neurons,
+        min_connections=network.min_connections,
+        max_connections=network.max_connections,
+        seed=network.seed,
+        memory=memory,
+    )
+
+    # 기존 스냅샷을 치우고 교체 (열려 있는 memmap은 지워진 파일을 계속 참조)
+    old_path = path + ".old"
+    shutil.rmtree(old_path, ignore_errors=True)
+    if os.path.exists(path):
+        os.replace(path, old_path)
+    os.replace(partial_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+
+def load_network(path, backend=None, mode="c", block_size=65536, **options):
+    """
+    스냅샷에서 네트워크를 불러옴.
+    numpy 백엔드에서는 배열을 memmap 그대로 사용하므로 큰 네트워크도 즉시 시작되고,
+    필요한 페이지만 디스크에서 읽힌다. options는 NeuronNetwork.from_state로 전달.
+    """
+    manifest = read_manifest(path)
+    xp = get_array_module(backend)
+
+    def load(name):
+        return _to_backend(xp, open_array(path, manifest, name, mode), block_size)
+
+    num_neurons = manifest["num_neurons"]
+    row_scale = load("row_scale") if "row_scale" in manifest["arrays"] else None
+    synapses = SynapseStore.from_csr(load("row_length"), load("targets"), load("weights"), num_neurons, xp,
+                                     row_scale)
+    return NeuronNetwork.from_state(
+        load("threshold"),
+        synapses,
+        manifest["min_connections"],
+        manifest["max_connections"],
+        backend=xp,
+        membrane_potential=load("membrane_potential"),
+        active_state=load("active_state"),
+        seed=manifest["seed"],
+        **options,
+    )
+
+
+def load_memory(path, memory_manager):
+    """
+    스냅샷에 저장된 장기 기억을 memory_manager에 불러옴.
+    저장된 가중치에 이미 통합이 반영되어 있으므로 불러온 기억은 다시 통합하지 않는다.
+    """
+    manifest = read_manifest(path)
+    if manifest.get("memory") is None:
+        return
+    lengths = open_array(path, manifest, "memory_lengths")
+    patterns = open_array(path, manifest, "memory_patterns")
+    offset = 0
+    for length, text in zip(lengths.tolist(), manifest["memory"]["texts"]):
+        memory_manager.store_memory(text, np.array(patterns[offset:offset + length]), consolidate=False)
+        offset += length
@@ -0,0 +1,56 @@
+from collections import namedtuple
+
+import numpy as np
+
+# 희소 자극: 자극할 뉴런 인덱스(int64)와 값(float32)
+Stimulus = namedtuple("Stimulus", ["indices", "values"])
+
+MODALITIES = ("text", "audio", "vision")  # 기본 영역의 배치 순서
+
+
+def check_region(num_neurons, region_start, region_size=None):
+    """
+    [region_start, region_start + region_size) 영역이 뉴런 범위 안에 있는지 확인하고 (시작, 크기)를 반환.
+    region_size가 None이면 region_start부터 마지막 뉴런까지.
+    """
+    if region_size is None:
+        region_size = num_neurons - region_start
+    if region_start < 0 or region_size < 0 or region_start + region_size > num_neurons:
+        raise ValueError(
+            f"Region [{region_start}, {region_start + region_size}) is outside the network of {num_neurons} neurons."
+        )
+    return region_start, region_size
+
+
+def sensory_region(modality, num_neurons, region_start=None, region_size=None):
+    """
+    감각 modality의 뉴런 영역 (시작, 크기).
+    region_start가 없으면 뉴런 공간을 MODALITIES 순서로 삼등분한 기본 영역을 사용하므로
+    텍스트, 청각, 시각 입력이 서로 다른 뉴런을 자극한다.
+    """
+    if region_start is None:
+        index = MODALITIES.index(modality)
+        region_start = index * num_neurons // len(MODALITIES)
+        if region_size is None:
+            region_size = (index + 1) * num_neurons // len(MODALITIES) - region_start
+    return check_region(num_neurons, region_start, region_size)
+
+
+def region_stimulus(values, num_neurons, region_start=0, region_size=None):
+    """
+    값 배열을 [region_start, region_start + region_size) 뉴런 영역에 배치한 희소 자극을 생성.
+    영역보다 긴 입력은 잘리고, 0인 값은 자극에서 제외된다. 영역이 뉴런 범위를 벗어나면 ValueError.
+    """
+    region_start, region_size = check_region(num_neurons, region_start, region_size)
+    values = np.asarray(values, dtype=np.float32).reshape(-1)[:region_size]
+    nonzero = np.flatnonzero(values)
+    return Stimulus(nonzero + region_start, values[nonzero])
+
+
+def to_dense(stimulus, num_neurons):
+    """
+    희소 자극을 길이 num_neurons의 신호 배열로 변환.
+    """
+    signals = np.zeros(num_neurons, dtype=np.float32)
+    np.add.at(signals, stimulus.indices, stimulus.values)
+    return signals
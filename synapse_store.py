@@ -0,0 +1,458 @@
+import numpy as np
+
+QUANTIZED_MAX = 255  # uint8 가중치 코드의 최대값
+RESCALE_HEADROOM = 1.25  # 코드 범위를 넘어 scale을 키울 때 둘 여유 (재양자화 빈도 감소)
+GROWTH_SLACK = 0.25  # 풀을 다시 구성할 때 행마다 둘 여유 용량 비율
+REBUILD_FRACTION = 0.25  # 넘치는 행들의 새 용량 합이 풀의 이 비율을 넘으면 행별 재배치 대신 풀을 재구성
+RESERVE_GROWTH = 1.25  # 풀 배열을 늘릴 때의 배율
+WASTE_FRACTION = 0.5  # 시냅스가 없는 슬롯이 시냅스 수의 이 비율을 넘으면 압축 대상
+COPY_BLOCK = 1 << 22  # 풀을 다시 구성할 때 한 번에 옮기는 시냅스 수 (임시 배열 크기 제한)
+
+
+def quantize_rows(xp, weights):
+    """
+    (행 수, k) 실수 가중치를 행마다 최대값이 QUANTIZED_MAX가 되는 scale의 uint8 코드로 양자화 (반올림).
+    (코드, 행별 float32 scale)을 반환.
+    """
+    if weights.shape[1] == 0:
+        return weights.astype(xp.uint8), xp.zeros(len(weights), dtype=xp.float32)
+    scale = (weights.max(axis=1) / QUANTIZED_MAX).astype(xp.float32)
+    codes = xp.rint(weights / xp.where(scale > 0, scale, 1)[:, None])
+    return xp.minimum(codes, QUANTIZED_MAX).astype(xp.uint8), scale
+
+
+def stochastic_quantize(xp, values, scale, rng=None):
+    """
+    실수 값을 scale 단위의 uint8 코드로 확률적 반올림 (기대값이 원래 값과 같아 작은 갱신도 평균적으로 보존).
+    rng는 난수 생성기 (None이면 전역 난수).
+    """
+    rng = xp.random if rng is None else rng
+    codes = xp.where(scale > 0, values / xp.where(scale > 0, scale, 1), 0)
+    codes = xp.floor(codes + rng.random_sample(codes.shape))
+    return xp.clip(codes, 0, QUANTIZED_MAX).astype(xp.uint8)
+
+
+def segment_ids(xp, lengths, total):
+    """
+    길이가 lengths인 구간들을 펼쳤을 때 각 위치가 속한 구간 번호를 반환.
+    """
+    if xp is np:
+        return np.repeat(np.arange(len(lengths)), lengths)
+    # cupy.repeat는 배열 반복 횟수를 지원하지 않으므로 누적합 위에서 이진 탐색
+    ends = xp.cumsum(lengths)
+    return xp.searchsorted(ends, xp.arange(total), side='right')
+
+
+def segment_positions(xp, starts, lengths):
+    """
+    여러 구간 [start, start + length)의 위치를 하나의 배열로 펼침.
+    (위치 배열, 각 위치가 속한 구간 번호)를 반환.
+    """
+    total = int(lengths.sum())
+    if total == 0:
+        empty = xp.zeros(0, dtype=xp.int64)
+        return empty, empty
+    seg = segment_ids(xp, lengths, total)
+    offsets = xp.cumsum(lengths) - lengths  # 각 구간의 펼친 배열 내 시작 위치
+    positions = xp.arange(total, dtype=xp.int64) - offsets[seg] + starts[seg]
+    return positions, seg
+
+
+class SynapseStore:
+    """
+    가변 길이 시냅스 저장소 (행마다 여유 용량을 둔 CSR).
+    행 i(프리뉴런)의 시냅스는 풀 배열 targets/weights의
+    [row_start[i], row_start[i] + row_length[i]) 구간에 있고,
+    row_capacity[i]까지는 재배치 없이 늘어날 수 있다.
+    용량이 부족한 행은 풀 끝으로 옮기면서 용량을 2배로 늘리므로 성장은 상환 O(1)이다.
+    다만 한 번에 넘치는 행이 많으면 행마다 옮기지 않고 GROWTH_SLACK의 여유를 두고 풀을 한 번 재구성해
+    풀 크기가 실제 시냅스 수에 비례하도록 유지한다. 버려진 구간과 가지치기된(가중치 0) 연결은
+    compact()에서 회수하며, needs_compaction()으로 압축할 때인지 확인한다.
+    num_targets는 타깃 인덱스 공간의 크기 (기본값 num_neurons). 분할된 네트워크의 조각처럼
+    일부 행만 가진 저장소는 행 수보다 큰 전체 뉴런 공간으로 신호를 보낸다.
+    row_scale이 있으면 weights는 uint8 코드이고 실제 가중치는 코드 * row_scale[행]이다 (양자화 모드).
+    가중치는 양자화 여부와 관계없이 weight_values/set_weight_values 등의 메서드로 읽고 쓴다.
+    """
+
+    def __init__(self, row_start, row_length, row_capacity, targets, weights, pool_size, num_neurons, xp,
+                 row_scale=None, num_targets=None):
+        self.xp = xp
+        self.num_neurons = num_neurons  # 행(프리뉴런) 수
+        self.num_targets = num_neurons if num_targets is None else num_targets
+        self.row_start = row_start
+        self.row_length = row_length
+        self.row_capacity = row_capacity
+        self.targets = targets  # 풀 배열 (pool_size 이후는 예약 공간)
+        self.weights = weights
+        self.pool_size = pool_size  # 풀에서 사용 중인 끝 위치
+        self.row_scale = row_scale  # 양자화 모드의 행별 가중치 단위 (float32)
+        self.dead_slots = 0  # 재배치로 버려진 구간의 크기
+        self.rng = None  # 확률적 반올림에 쓸 난수 생성기 (None이면 전역 난수)
+        self._slot_rows = None  # dense 전파용 슬롯 -> 행 번호 캐시 (구조가 바뀌면 무효화)
+
+    @classmethod
+    def from_rows(cls, lengths, targets, weights, num_neurons, xp, slack=0.0, min_capacity=0, row_scale=None,
+                  num_targets=None):
+        """
+        행 길이와 행 순서대로 이어붙인 타깃/가중치로 저장소를 일괄 생성.
+        각 행은 length * (1 + slack)과 min_capacity 중 큰 만큼의 용량을 가진다.
+        """
+        lengths = xp.asarray(lengths, dtype=xp.int64)
+        capacity = lengths + xp.ceil(lengths * slack).astype(xp.int64)
+        capacity = xp.maximum(capacity, min_capacity)
+        row_start = xp.cumsum(capacity) - capacity
+        pool_size = int(capacity.sum())
+
+        pool_targets = xp.zeros(pool_size, dtype=targets.dtype)
+        pool_weights = xp.zeros(pool_size, dtype=weights.dtype)
+        destination, _ = segment_positions(xp, row_start, lengths)
+        pool_targets[destination] = targets
+        pool_weights[destination] = weights
+        return cls(row_start, lengths, capacity, pool_targets, pool_weights, pool_size, num_neurons, xp, row_scale,
+                   num_targets)
+
+    @classmethod
+    def from_csr(cls, row_length, targets, weights, num_neurons, xp, row_scale=None, num_targets=None):
+        """
+        여유 용량 없이 연속으로 저장된 CSR 배열(행 길이, 타깃, 가중치)을 그대로 풀로 사용.
+        """
+        row_length = xp.asarray(row_length, dtype=xp.int64)
+        row_start = xp.cumsum(row_length) - row_length
+        return cls(row_start, row_length, row_length.copy(), targets, weights, len(targets), num_neurons, xp,
+                   row_scale, num_targets)
+
+    @classmethod
+    def from_dense(cls, connections, weights, xp, row_scale=None, num_targets=None):
+        """
+        (num_neurons, k) 형태의 연결/가중치 배열로 저장소를 생성.
+        C 연속 배열이면 복사 없이 같은 메모리를 풀로 사용한다.
+        """
+        num_neurons, degree = connections.shape
+        row_start = xp.arange(num_neurons, dtype=xp.int64) * degree
+        row_length = xp.full(num_neurons, degree, dtype=xp.int64)
+        return cls(row_start, row_length, row_length.copy(), connections.reshape(-1), weights.reshape(-1),
+                   num_neurons * degree, num_neurons, xp, row_scale, num_targets)
+
+    @property
+    def nnz(self):
+        """
+        저장된 시냅스 수.
+        """
+        return int(self.row_length.sum())
+
+    def memory_bytes(self):
+        """
+        저장소가 점유한 바이트 수 (예약 공간 포함).
+        """
+        arrays = (self.row_start, self.row_length, self.row_capacity, self.targets, self.weights, self.row_scale)
+        return sum(int(a.nbytes) for a in arrays if a is not None)
+
+    def row_lengths(self, rows=None):
+        """
+        각 행(프리뉴런)의 시냅스 수.
+        """
+        if rows is None:
+            return self.row_length
+        return self.row_length[rows]
+
+    def row_positions(self, rows=None):
+        """
+        주어진 행들의 시냅스 위치와 각 위치가 속한 rows 내 순번을 반환.
+        rows가 None이면 모든 행 (이때 순번은 곧 뉴런 번호).
+        """
+        if rows is None:
+            return segment_positions(self.xp, self.row_start, self.row_length)
+        rows = self.xp.asarray(rows, dtype=self.xp.int64)
+        return segment_positions(self.xp, self.row_start[rows], self.row_length[rows])
+
+    def _row_ids(self, rows, seg):
+        """
+        구간 번호 seg를 행 번호로 변환 (rows가 None이면 seg가 곧 행 번호).
+        """
+        if rows is None:
+            return seg
+        return self.xp.asarray(rows, dtype=self.xp.int64)[seg]
+
+    def weight_values(self, positions, rows, seg):
+        """
+        위치 positions의 실제 가중치. 각 위치의 행은 rows[seg] (row_positions의 반환값과 같은 형태).
+        """
+        if self.row_scale is None:
+            return self.weights[positions]
+        return self.weights[positions] * self.row_scale[self._row_ids(rows, seg)]
+
+    def set_weight_values(self, positions, rows, seg, values):
+        """
+        위치 positions의 가중치를 실제 값 values로 설정.
+        양자화 모드에서는 확률적 반올림으로 코드를 정하고, 코드 범위를 넘는 값이 있는 행은 scale을 키워
+        행 전체를 다시 양자화한다.
+        """
+        if self.row_scale is None:
+            self.weights[positions] = values
+            return
+        xp = self.xp
+        row_ids = self._row_ids(rows, seg)
+        values = xp.maximum(xp.asarray(values, dtype=xp.float32), 0)
+        overflow = values > self.row_scale[row_ids] * QUANTIZED_MAX
+        if bool(overflow.any()):
+            self._rescale_rows(row_ids[overflow], values[overflow])
+        self.weights[positions] = stochastic_quantize(xp, values, self.row_scale[row_ids], self.rng)
+
+    def add_weight_values(self, positions, rows, seg, delta):
+        """
+        위치 positions의 가중치에 delta를 더함 (positions는 중복 없음).
+        """
+        self.set_weight_values(positions, rows, seg, self.weight_values(positions, rows, seg) + delta)
+
+    def scale_weights(self, factor):
+        """
+        모든 가중치에 factor를 곱함. 양자화 모드에서는 행별 scale만 바꾸므로 반올림 오차가 없다.
+        """
+        if self.row_scale is None:
+            self.weights *= factor
+        else:
+            self.row_scale *= factor
+
+    def prune_weak(self, rows, threshold):
+        """
+        주어진 행들에서 가중치가 threshold보다 작은 연결을 0으로 표시 (compact_rows에서 제거됨).
+        """
+        positions, seg = self.row_positions(rows)
+        weak = positions[self.weight_values(positions, rows, seg) < threshold]
+        self.weights[weak] = 0
+
+    def _rescale_rows(self, row_ids, values):
+        """
+        행 row_ids[k]에 값 values[k]가 들어가도록 scale을 (여유를 두고) 키우고 행의 기존 코드를 다시 양자화.
+        """
+        xp = self.xp
+        # 행별 최대 요구값: (행, 값) 순으로 정렬한 뒤 각 행의 마지막 항목
+        order = xp.lexsort(xp.stack([values.astype(xp.float64), row_ids.astype(xp.float64)]))
+        row_ids, values = row_ids[order], values[order]
+        last = xp.ones(len(row_ids), dtype=bool)
+        last[:-1] = row_ids[1:] != row_ids[:-1]
+        rows, peaks = row_ids[last], values[last]
+
+        scale = (peaks * (RESCALE_HEADROOM / QUANTIZED_MAX)).astype(xp.float32)
+        positions, seg = self.row_positions(rows)
+        real = self.weights[positions] * self.row_scale[rows][seg]
+        self.row_scale[rows] = scale
+        self.weights[positions] = stochastic_quantize(xp, real, scale[seg], self.rng)
+
+    def append(self, rows, counts, targets, weights):
+        """
+        각 행 rows[k]의 끝에 counts[k]개의 시냅스를 추가.
+        targets/weights는 rows 순서대로 이어붙인 새 시냅스 (rows는 중복 없음).
+        """
+        xp = self.xp
+        rows = xp.asarray(rows, dtype=xp.int64)
+        counts = xp.asarray(counts, dtype=xp.int64)
+        needed = self.row_length[rows] + counts
+        overflow = needed > self.row_capacity[rows]
+        if bool(overflow.any()):
+            # 용량을 2배씩 늘려 재배치 횟수를 상환 O(1)로 유지
+            grown = xp.maximum(needed[overflow], 2 * self.row_capacity[rows[overflow]])
+            if int(grown.sum()) > REBUILD_FRACTION * self.pool_size:
+                # 많은 행이 한꺼번에 넘치면 풀 끝에 2배 용량으로 쌓는 대신 여유를 두고 한 번에 재구성
+                required = xp.zeros(self.num_neurons, dtype=xp.int64)
+                required[rows] = needed
+                self._rebuild(required)
+            else:
+                self._relocate(rows[overflow], grown)
+
+        destination, seg = segment_positions(xp, self.row_start[rows] + self.row_length[rows], counts)
+        self.targets[destination] = targets
+        self.set_weight_values(destination, rows, seg, weights)
+        self.row_length[rows] += counts
+        self._slot_rows = None
+
+    def _reserve(self, extra):
+        """
+        풀 끝에 extra개의 슬롯을 확보 (부족하면 풀 배열을 RESERVE_GROWTH배로 확장).
+        """
+        required = self.pool_size + extra
+        if required <= len(self.targets):
+            return
+        self._slot_rows = None  # 확장하는 동안 이전 캐시를 함께 들고 있지 않도록 먼저 해제
+        size = max(required, int(len(self.targets) * RESERVE_GROWTH))
+        for name in ("targets", "weights"):
+            old = getattr(self, name)
+            new = self.xp.zeros(size, dtype=old.dtype)
+            new[:self.pool_size] = old[:self.pool_size]
+            setattr(self, name, new)
+
+    def _relocate(self, rows, capacity):
+        """
+        행들을 풀 끝의 새 구간(용량 capacity)으로 옮김.
+        """
+        xp = self.xp
+        total = int(capacity.sum())
+        self._reserve(total)
+        new_start = self.pool_size + xp.cumsum(capacity) - capacity
+        lengths = self.row_length[rows]
+        source, _ = segment_positions(xp, self.row_start[rows], lengths)
+        destination, _ = segment_positions(xp, new_start, lengths)
+        self.targets[destination] = self.targets[source]
+        self.weights[destination] = self.weights[source]
+
+        self.dead_slots += int(self.row_capacity[rows].sum())
+        self.pool_size += total
+        self.row_start[rows] = new_start
+        self.row_capacity[rows] = capacity
+
+    def _row_blocks(self, block_synapses=COPY_BLOCK):
+        """
+        행들을 시냅스가 대략 block_synapses개씩 되도록 나눈 연속 구간 [(시작 행, 끝 행)] 리스트.
+        """
+        xp = self.xp
+        ends = xp.cumsum(self.row_length)
+        total = int(ends[-1]) if self.num_neurons else 0
+        cuts = xp.searchsorted(ends, xp.arange(block_synapses, total, block_synapses), side="right").tolist()
+        bounds = sorted(set([0] + cuts + [self.num_neurons]))
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    def _repack(self, slack, min_capacity, drop_zero):
+        """
+        모든 행을 새 풀로 옮겨 담아 버려진 구간과 예약 공간을 없앰.
+        각 행의 용량은 length * (1 + slack)과 min_capacity(정수 또는 행별 배열) 중 큰 값이다.
+        drop_zero이면 가중치가 0인 연결은 옮기지 않는다. 행 블록 단위로 옮기므로 이전 풀과 새 풀 외의
+        임시 배열은 COPY_BLOCK 크기로 제한된다. 제거된 시냅스 수를 반환.
+        """
+        xp = self.xp
+        self._slot_rows = None
+        blocks = self._row_blocks()
+        lengths = self.row_length
+        if drop_zero:
+            lengths = xp.empty_like(self.row_length)
+            for start, stop in blocks:
+                positions, seg = self.row_positions(xp.arange(start, stop))
+                lengths[start:stop] = xp.bincount(seg[self.weights[positions] != 0], minlength=stop - start)
+        capacity = lengths + xp.ceil(lengths * slack).astype(xp.int64)
+        capacity = xp.maximum(capacity, min_capacity)
+        row_start = xp.cumsum(capacity) - capacity
+        pool_size = int(capacity.sum())
+        targets = xp.zeros(pool_size, dtype=self.targets.dtype)
+        weights = xp.zeros(pool_size, dtype=self.weights.dtype)
+        for start, stop in blocks:
+            rows = xp.arange(start, stop)
+            positions, _ = self.row_positions(rows)
+            if drop_zero:
+                positions = positions[self.weights[positions] != 0]
+            destination, _ = segment_positions(xp, row_start[rows], lengths[rows])
+            targets[destination] = self.targets[positions]
+            weights[destination] = self.weights[positions]
+        removed = self.nnz - int(lengths.sum())
+        self.row_start, self.row_length, self.row_capacity = row_start, lengths.copy(), capacity
+        self.targets, self.weights = targets, weights
+        self.pool_size = pool_size
+        self.dead_slots = 0
+        return removed
+
+    def _rebuild(self, min_capacity):
+        """
+        모든 행을 (가중치 0인 연결도 그대로) GROWTH_SLACK의 여유를 두고 새 풀로 옮겨 담음.
+        """
+        self._repack(GROWTH_SLACK, min_capacity, drop_zero=False)
+
+    def wasted_slots(self):
+        """
+        할당된 풀 배열에서 시냅스가 없는 슬롯 수 (버려진 구간, 행의 여유 용량, 예약 공간).
+        """
+        return len(self.targets) - self.nnz
+
+    def needs_compaction(self):
+        """
+        시냅스가 없는 슬롯이 실제 시냅스 수의 WASTE_FRACTION을 넘었는지 여부.
+        compact(slack=GROWTH_SLACK) 직후에는 항상 거짓이므로 매번 압축하는 일은 없다.
+        """
+        return self.wasted_slots() > WASTE_FRACTION * self.nnz
+
+    def compact(self, slack=0.0, min_capacity=0):
+        """
+        가중치가 0인(가지치기된) 연결과 버려진 구간을 제거하여 풀을 새로 구성.
+        제거된 시냅스 수를 반환.
+        """
+        return self._repack(slack, min_capacity, drop_zero=True)
+
+    def compact_rows(self, rows=None):
+        """
+        주어진 행들에서 가중치가 0인 연결을 제거하고 남은 연결을 행 앞쪽으로 당김 (제자리, 재할당 없음).
+        제거된 시냅스 수를 반환.
+        """
+        xp = self.xp
+        if rows is None:
+            rows = xp.arange(self.num_neurons)
+        rows = xp.asarray(rows, dtype=xp.int64)
+        positions, seg = self.row_positions(rows)
+        keep = self.weights[positions] != 0
+        kept = positions[keep]
+        lengths = xp.bincount(seg[keep], minlength=len(rows))
+        targets, weights = self.targets[kept], self.weights[kept]
+        destination, _ = segment_positions(xp, self.row_start[rows], lengths)
+        self.targets[destination] = targets
+        self.weights[destination] = weights
+        self.row_length[rows] = lengths
+        self._slot_rows = None
+        return int(len(positions) - len(kept))
+
+    def keep_strongest(self, rows, k):
+        """
+        각 행에서 가중치가 큰 k개만 남기고 나머지 연결의 가중치를 0으로 만듦.
+        (실제 가중치로 비교하므로 부호 없는 uint8 코드를 음수로 바꿀 때의 순환 문제가 없다.)
+        """
+        xp = self.xp
+        rows = xp.asarray(rows, dtype=xp.int64)
+        positions, seg = self.row_positions(rows)
+        if len(positions) == 0:
+            return
+        # 행 순서를 유지하면서 행 안에서는 가중치 내림차순으로 정렬한 뒤 행 내 순위 계산
+        values = self.weight_values(positions, rows, seg).astype(xp.float64)
+        order = xp.lexsort(xp.stack([-values, seg.astype(xp.float64)]))
+        lengths = self.row_length[rows]
+        offsets = xp.cumsum(lengths) - lengths
+        rank = xp.arange(len(positions)) - offsets[seg[order]]
+        self.weights[positions[order[rank >= k]]] = 0
+
+    def propagate(self, rows, row_values=None):
+        """
+        활성 프리뉴런 행만 골라 희소 행렬-벡터 곱으로 포스트뉴런 입력을 계산.
+        row_values가 없으면 각 활성 행의 출력은 1.
+        중복된 타깃도 모두 누적된다.
+        """
+        xp = self.xp
+        positions, seg = self.row_positions(rows)
+        if len(positions) == 0:
+            return xp.zeros(self.num_targets)
+        signal = self.weight_values(positions, rows, seg)
+        if row_values is not None:
+            signal = signal * xp.asarray(row_values)[seg]
+        return xp.bincount(self.targets[positions], weights=signal, minlength=self.num_targets)
+
+    def _slot_row_map(self):
+        """
+        풀의 슬롯마다 소속 행 번호를 담은 배열 (사용하지 않는 슬롯은 num_neurons).
+        뉴런 수가 2^31보다 작으면 int32로 저장해 시냅스당 4바이트만 사용한다.
+        """
+        if self._slot_rows is None or len(self._slot_rows) != len(self.targets):
+            xp = self.xp
+            dtype = xp.int32 if self.num_neurons < 2**31 - 1 else xp.int64
+            positions, rows = self.row_positions()
+            slot_rows = xp.full(len(self.targets), self.num_neurons, dtype=dtype)
+            slot_rows[positions] = rows
+            self._slot_rows = slot_rows
+        return self._slot_rows
+
+    def propagate_dense(self, spikes):
+        """
+        전체 시냅스 풀을 한 번에 처리하여 포스트뉴런 입력을 계산.
+        spikes는 뉴런별 출력(불리언 또는 실수) 벡터. 활성 비율이 높을 때는
+        활성 행의 위치를 매번 계산하는 것보다 캐시된 슬롯-행 배열을 재사용하는 편이 빠르다.
+        """
+        xp = self.xp
+        dtype = self.weights.dtype if self.row_scale is None else self.row_scale.dtype
+        output = xp.zeros(self.num_neurons + 1, dtype=dtype)
+        output[:-1] = spikes  # 마지막 칸은 사용하지 않는 슬롯용 0
+        if self.row_scale is not None:
+            output[:-1] *= self.row_scale  # 양자화 모드: 행별 scale을 출력에 곱해 코드에 그대로 적용
+        signal = self.weights * output[self._slot_row_map()]
+        return xp.bincount(self.targets, weights=signal, minlength=self.num_targets)
@@ -0,0 +1,103 @@
+import importlib.util
+import os
+import sys
+
+import numpy as np
+import pytest
+
+import neuron_model
+
+LEGACY_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "project-neuralcloud-A 01")
+
+
+def load_legacy_neuron_model():
+    """
+    이전 버전 디렉터리의 neuron_model을 최상위 모듈과 겹치지 않는 이름으로 불러옴.
+    """
+    sys.path.append(LEGACY_DIR)  # synapse 모듈 (backend는 최상위 모듈을 사용)
+    try:
+        path = os.path.join(LEGACY_DIR, "neuron_model.py")
+        spec = importlib.util.spec_from_file_location("legacy_neuron_model", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(LEGACY_DIR)
+    return module
+
+
+class CountingExecutor:
+    """
+    제출 즉시 실행하고, 결과를 아직 가져가지 않은 블록(뉴런 수)의 최대치를 기록하는 가짜 작업자 풀.
+    """
+
+    def __init__(self, max_workers):
+        self.in_flight = []
+        self.max_blocks = 0
+        self.max_neurons = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def submit(self, fn, *args):
+        executor = self
+        result = fn(*args)
+
+        class Future:
+            def result(self):
+                executor.in_flight.remove(self)
+                return result
+
+        future = Future()
+        future.neurons = args[2] - args[1]
+        self.in_flight.append(future)
+        self.max_blocks = max(self.max_blocks, len(self.in_flight))
+        self.max_neurons = max(self.max_neurons, sum(item.neurons for item in self.in_flight))
+        return future
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    executors = []
+
+    def make(module):
+        def factory(max_workers):
+            executors.append(CountingExecutor(max_workers))
+            return executors[-1]
+
+        monkeypatch.setattr(module, "ProcessPoolExecutor", factory)
+        return executors
+
+    return make
+
+
+@pytest.mark.parametrize("workers", [2, 4, 16])
+def test_neuron_blocks_in_flight_are_bounded(executor, workers):
+    executors = executor(neuron_model)
+    block_size = 8 * neuron_model.SEED_CHUNK
+
+    blocks = list(neuron_model.iter_neuron_blocks(1, 20 * neuron_model.SEED_CHUNK, 2, block_size, workers=workers))
+
+    _, window = neuron_model.generation_window(block_size, workers)
+    assert executors[0].max_blocks <= window
+    assert executors[0].max_neurons <= 2 * block_size
+    assert sum(block[1] - block[0] for block in blocks) == 20 * neuron_model.SEED_CHUNK
+
+
+@pytest.mark.parametrize("workers", [2, 4, 16])
+def test_legacy_synapse_blocks_in_flight_are_bounded(executor, workers):
+    legacy = load_legacy_neuron_model()
+    executors = executor(legacy)
+    block_size = 8 * legacy.SEED_CHUNK
+    num_neurons = 20 * legacy.SEED_CHUNK
+
+    blocks = list(legacy.iter_synapse_blocks(1, num_neurons, 1, 3, block_size, workers=workers))
+
+    _, window = legacy.generation_window(block_size, workers)
+    assert executors[0].max_blocks <= window
+    assert executors[0].max_neurons <= 2 * block_size
+    assert np.array_equal(np.concatenate([block[4] for block in blocks]),
+                          np.concatenate([block[4] for block in legacy.iter_synapse_blocks(1, num_neurons, 1, 3,
+                                                                                          block_size)]))
@@ -0,0 +1,31 @@
+import numpy as np
+
+from memory_index import MinHashIndex
+from memory_store import MemoryStore
+
+
+def test_index_reuses_removed_ids():
+    index = MinHashIndex()
+    rng = np.random.default_rng(0)
+    live = []
+    for step in range(1000):
+        live.append(index.add(index.signature(rng.choice(10000, 50, replace=False))))
+        if len(live) > 10:
+            index.remove(live.pop(0))
+
+    assert index.size <= 11
+    assert len(index.signatures) <= 16
+    pattern = rng.choice(10000, 50, replace=False)
+    pattern_id = index.add(index.signature(pattern))
+    assert index.query(index.signature(pattern), threshold=1.0)[0][0] == pattern_id
+
+
+def test_store_counts_cold_memories(tmp_path):
+    store = MemoryStore(1000, budget_bytes=200, cold_path=str(tmp_path / "cold.sqlite"))
+    for memory_id in range(20):
+        store.add(memory_id, np.arange(memory_id, memory_id + 10), f"memory {memory_id}")
+    store.reinforce(0)  # cold에서 hot으로
+
+    assert store.cold_count() == store.cold.execute("SELECT COUNT(*) FROM memories").fetchone()[0]
+    assert store.cold_count() > 0 and len(store) == 20
+    store.close()
@@ -0,0 +1,55 @@
+import os
+
+import main
+
+SCRIPT = """\
+text hello world
+text the quick brown fox
+text hello again
+text jumps over the lazy dog
+"""
+
+
+def snapshot_files(path):
+    files = {}
+    for root, _, names in os.walk(path):
+        for name in names:
+            file_path = os.path.join(root, name)
+            with open(file_path, "rb") as f:
+                files[os.path.relpath(file_path, path)] = f.read()
+    return files
+
+
+def replay(tmp_path, name, seed):
+    script = tmp_path / "session.txt"
+    script.write_text(SCRIPT, encoding="utf-8")
+    snapshot = tmp_path / name
+    main.main(["--replay", str(script), "--seed", str(seed), "--snapshot", str(snapshot),
+               "--neurons", "3000", "--min-connections", "20", "--max-connections", "60",
+               "--output", str(tmp_path / f"{name}.jsonl")])
+    return snapshot_files(snapshot)
+
+
+def test_replay_with_same_seed_is_deterministic(tmp_path):
+    first = replay(tmp_path, "first", seed=7)
+    second = replay(tmp_path, "second", seed=7)
+
+    assert first and first.keys() == second.keys()
+    for name in first:
+        assert first[name] == second[name], name
+
+
+def test_replay_with_different_seed_differs(tmp_path):
+    assert replay(tmp_path, "first", seed=7) != replay(tmp_path, "second", seed=8)
+
+
+def test_summary_goes_to_stderr(tmp_path, capsys):
+    script = tmp_path / "session.txt"
+    script.write_text(SCRIPT, encoding="utf-8")
+    main.main(["--replay", str(script), "--seed", "1", "--metrics", "summary",
+               "--neurons", "3000", "--min-connections", "20", "--max-connections", "60"])
+
+    out, err = capsys.readouterr()
+    lines = out.splitlines()
+    assert lines and all(line.startswith("{") for line in lines)  # 표준 출력에는 JSON lines만
+    assert "phase" in err
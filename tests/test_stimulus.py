@@ -0,0 +1,29 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from cochlea_processor import CochleaProcessor
+from retina_processor import RetinaProcessor
+from stimulus import region_stimulus
+from text_processor import TextProcessor
+
+
+@pytest.mark.parametrize("region_start, region_size", [(-1, 10), (95, 10), (0, 101), (101, None)])
+def test_region_outside_network_is_rejected(region_start, region_size):
+    with pytest.raises(ValueError):
+        region_stimulus(np.ones(5), 100, region_start, region_size)
+    with pytest.raises(ValueError):
+        TextProcessor(SimpleNamespace(num_neurons=100), region_start=region_start, region_size=region_size)
+
+
+def test_default_regions_do_not_overlap():
+    network = SimpleNamespace(num_neurons=30000)
+    regions = [
+        (processor.region_start, processor.region_start + processor.region_size)
+        for processor in (TextProcessor(network), CochleaProcessor(network), RetinaProcessor(network))
+    ]
+
+    assert regions == [(0, 10000), (10000, 20000), (20000, 30000)]
+    stimulus = CochleaProcessor(network).process_audio(np.random.default_rng(0).standard_normal(8192), 16000)
+    assert stimulus.indices.min() >= 10000 and stimulus.indices.max() < 20000
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from synapse_store import SynapseStore
+
+
+def make_row(weights, row_scale=None):
+    weights = np.asarray(weights)
+    targets = np.arange(len(weights), dtype=np.int64)
+    return SynapseStore.from_rows([len(weights)], targets, weights, 1, np, row_scale=row_scale,
+                                  num_targets=len(weights))
+
+
+@pytest.mark.parametrize("quantized", [False, True])
+def test_keep_strongest_keeps_largest_weights(quantized):
+    codes = [0, 10, 200, 255, 50, 0]
+    if quantized:
+        store = make_row(np.array(codes, dtype=np.uint8), row_scale=np.full(1, 0.01, dtype=np.float32))
+    else:
+        store = make_row(np.array(codes, dtype=np.float64) / 100)
+
+    store.keep_strongest(np.array([0]), 3)
+
+    kept = np.flatnonzero(store.weights[:6])
+    assert kept.tolist() == [2, 3, 4]  # 200, 255, 50
+
+
+def test_keep_strongest_per_row():
+    lengths = [4, 3]
+    targets = np.arange(7, dtype=np.int64)
+    codes = np.array([0, 1, 128, 254, 3, 2, 1], dtype=np.uint8)
+    store = SynapseStore.from_rows(lengths, targets, codes, 2, np, row_scale=np.ones(2, dtype=np.float32),
+                                   num_targets=7)
+
+    store.keep_strongest(np.array([0, 1]), 2)
+
+    assert store.weights.tolist() == [0, 0, 128, 254, 3, 2, 0]
@@ -1,21 +1,91 @@
+from collections import OrderedDict
+
 import numpy as np
 
+from stimulus import Stimulus, region_stimulus, sensory_region
+
+ENCODINGS = ("byte", "codepoint", "ngram")
+MAX_CODE_POINT = 0x10FFFF
+NGRAM_HASH = np.uint32(2654435761)  # 곱셈 해시 상수 (Knuth)
+
 
 class TextProcessor:
-    def __init__(self, neuron_network):
+    """
+    텍스트를 뉴런 자극으로 변환하는 클래스.
+    - encoding='byte': UTF-8 바이트마다 뉴런 하나 (값 = 바이트 / 255)
+    - encoding='codepoint': 문자마다 뉴런 하나 (값 = 코드 포인트의 로그 스케일, 255를 넘는 문자도 [0, 1])
+    - encoding='ngram': 바이트 n-gram을 해시하여 영역 안의 고정 위치에 누적 (텍스트 길이와 무관한 크기)
+    byte/codepoint에서 영역보다 긴 텍스트는 잘린다. 최근 변환한 문자열은 LRU 캐시에 보관한다.
+    """
+
+    def __init__(self, neuron_network, region_start=None, region_size=None, encoding="byte", ngram=3,
+                 cache_size=1024):
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unknown text encoding: {encoding!r} (expected one of {ENCODINGS}).")
+        if not 1 <= ngram <= 4:
+            raise ValueError("ngram must be between 1 and 4.")
         self.network = neuron_network
+        # 텍스트 신호를 받을 뉴런 영역 (기본값은 sensory_region의 텍스트 영역)
+        self.region_start, self.region_size = sensory_region(
+            "text", neuron_network.num_neurons, region_start, region_size
+        )
+        self.encoding = encoding
+        self.ngram = ngram
+        self.cache_size = cache_size
+        self._cache = OrderedDict()  # 텍스트 -> Stimulus, 최근 사용 순
+
+    def _ngram_signals(self, data):
+        """
+        바이트 n-gram을 32비트 정수로 묶어 해시한 뒤 영역 안의 위치별 등장 횟수를 [0, 1]로 정규화.
+        """
+        n = min(self.ngram, len(data))
+        count = len(data) - n + 1
+        grams = np.zeros(count, dtype=np.uint32)
+        for offset in range(n):
+            grams |= data[offset:offset + count].astype(np.uint32) << np.uint32(8 * offset)
+        slots = (grams * NGRAM_HASH) % np.uint32(self.region_size)
+        slots, counts = np.unique(slots, return_counts=True)
+        values = (counts / counts.max()).astype(np.float32)
+        return Stimulus(slots.astype(np.int64) + self.region_start, values)
+
+    def _encode(self, text):
+        if self.encoding == "codepoint":
+            code_points = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+            normalized = np.log1p(code_points, dtype=np.float32) / np.float32(np.log1p(MAX_CODE_POINT))
+        else:
+            data = np.frombuffer(text.encode("utf-8"), dtype=np.uint8)
+            if self.encoding == "ngram":
+                if len(data) == 0:
+                    return region_stimulus(data, self.network.num_neurons, self.region_start, 0)
+                return self._ngram_signals(data)
+            normalized = data / np.float32(255.0)
+        return region_stimulus(normalized, self.network.num_neurons, self.region_start, self.region_size)
 
     def text_to_signals(self, text):
         """
-        텍스트를 뉴런 신호로 변환.
+        텍스트를 뉴런 신호(희소 자극)로 변환. 캐시된 자극은 읽기 전용 배열을 공유한다.
         """
-        ascii_values = np.array([ord(char) for char in text])
-        normalized = ascii_values / 255.0
-        signals = np.pad(normalized, (0, self.network.num_neurons - len(normalized)), 'constant')
-        return signals
+        stimulus = self._cache.get(text)
+        if stimulus is not None:
+            self._cache.move_to_end(text)
+            return stimulus
+        stimulus = self._encode(text)
+        if self.cache_size:
+            stimulus.indices.setflags(write=False)
+            stimulus.values.setflags(write=False)
+            self._cache[text] = stimulus
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return stimulus
 
     def process_text(self, text):
         """
         입력 텍스트를 처리하여 뉴런 네트워크에 전달할 신호로 변환.
         """
         return self.text_to_signals(text)
+
+    def process_texts(self, texts):
+        """
+        여러 텍스트를 자극 리스트로 변환 (NeuronNetwork.run_batch에 그대로 전달 가능).
+        """
+        return [self.text_to_signals(text) for text in texts]